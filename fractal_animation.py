@@ -0,0 +1,406 @@
+"""Animation export: depth sweeps, Mandelbrot zoom paths and palette cycles.
+
+Frames are rendered by a process pool and streamed in order to a writer that
+encodes them as they arrive, so only a few frames are ever in memory. Work is
+shared between frames: every worker of a depth sweep keeps the geometry it
+has built and subdivides its deepest level instead of regenerating it, and a
+palette cycle computes the Mandelbrot iterations once and only remaps them
+through a shifted lookup table.
+
+Outputs ending in .mp4 are encoded by ffmpeg, .gif frame by frame with Pillow,
+and anything containing {frame} is written as a numbered PNG sequence. GIF
+frames of the Mandelbrot set share its lookup table as their palette, those
+of a depth sweep each carry a colour table of their own colours.
+
+Examples:
+    python fractal_animation.py depth --fractal "Sierpinski Triangle" --depth 8 -o sierpinski.gif
+    python fractal_animation.py zoom --center -0.743643887037151 0.131825904205330 --zoom 1e6 --frames 240 -o zoom.mp4
+    python fractal_animation.py palette --frames 120 -o "cycle/frame_{frame:04d}.png"
+"""
+import argparse
+import math
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import matplotlib.image as mpimg
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from fractal_batch import FRACTALS, fit_viewport, parse_size
+from fractal_engine import (cantor_subdivide, complex_grid, escape_time, escape_time_perturbation, escape_time_tiled,
+                            koch_subdivide, offset_point, sierpinski_subdivide, smooth_iterations)
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES, mandelbrot_palette
+from fractal_raster import rasterize
+
+
+class PngSequenceWriter:
+    """Writes every frame to its own PNG, named by formatting pattern with frame=<index>."""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.count = 0
+        folder = os.path.dirname(pattern.format(frame=0))
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def write(self, frame: np.ndarray):
+        mpimg.imsave(self.pattern.format(frame=self.count), frame, format='png')
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class FFmpegWriter:
+    """Pipes raw RGBA frames into an ffmpeg process that encodes them as an MP4 as they arrive."""
+
+    def __init__(self, path: str, width: int, height: int, fps: float):
+        # yuv420p needs even dimensions
+        command = ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                   '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit status {self.process.returncode}")
+
+
+def distinct_colors(frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """((n, 3) int32 distinct RGB colours of a frame, index of every pixel's colour among them)."""
+    rgb = frame[..., :3].reshape(-1, 3).astype(np.int32)
+    unique, inverse = np.unique(rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2], return_inverse=True)
+    return np.stack([unique >> 16, unique >> 8 & 255, unique & 255], axis=1), inverse.ravel()
+
+
+def nearest_colors(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """Index of the nearest palette entry of every colour."""
+    palette = np.asarray(palette, dtype=np.int32)
+    nearest = np.empty(len(colors), dtype=np.uint8)
+    # Distances of a block of distinct colours at a time, so smooth frames don't need a huge matrix
+    for start in range(0, len(colors), 4096):
+        block = colors[start:start + 4096, None, :] - palette[None]
+        nearest[start:start + 4096] = (block ** 2).sum(axis=-1).argmin(axis=1)
+    return nearest
+
+
+def frame_palette(frame: np.ndarray) -> np.ndarray:
+    """(256, 3) uint8 palette quantized from the colours of one frame."""
+    image = Image.fromarray(np.ascontiguousarray(frame[..., :3])).quantize(256)
+    return np.asarray(image.getpalette()[:768], dtype=np.uint8).reshape(-1, 3)
+
+
+class GifWriter:
+    """Appends every frame to a GIF as it arrives.
+
+    palette is an (n, 3) uint8 array of at most 256 colours shared by all frames,
+    ideally the lookup table the frames were coloured from so that they map onto
+    it exactly. Without one, every frame carries a local colour table of its own
+    colours, exact up to 256 of them and quantized beyond.
+    """
+
+    def __init__(self, path: str, fps: float, palette: np.ndarray = None):
+        self.duration = round(1000 / fps)
+        self.palette = palette
+        self.started = False
+        self.file = open(path, 'wb')
+
+    def indexed(self, frame: np.ndarray) -> Image.Image:
+        """Frame as a 'P' image, every pixel mapped to the nearest colour of the palette or of its own table."""
+        colors, inverse = distinct_colors(frame)
+        if self.palette is not None:
+            palette = self.palette
+            index = nearest_colors(colors, palette)
+        elif len(colors) <= 256:
+            palette = colors
+            index = np.arange(len(colors), dtype=np.uint8)
+        else:
+            palette = frame_palette(frame)
+            index = nearest_colors(colors, palette)
+        image = Image.frombytes('P', (frame.shape[1], frame.shape[0]), index[inverse].tobytes())
+        image.putpalette(np.asarray(palette, dtype=np.uint8).ravel().tolist())
+        return image
+
+    def write(self, frame: np.ndarray):
+        indexed = self.indexed(frame)
+        if not self.started:
+            header, _ = GifImagePlugin.getheader(indexed, info={'loop': 0})
+            self.file.write(b''.join(header))
+            self.started = True
+        for data in GifImagePlugin.getdata(indexed, duration=self.duration,
+                                           include_color_table=self.palette is None):
+            self.file.write(data)
+
+    def close(self):
+        if not self.file.closed:
+            # GIF trailer
+            self.file.write(b';')
+            self.file.close()
+
+
+def open_writer(output: str, width: int, height: int, fps: float = 24, palette: np.ndarray = None):
+    """Frame writer for an output path: MP4 or GIF file, or a PNG sequence pattern containing {frame}.
+
+    palette is the fixed GIF palette, see GifWriter; other outputs ignore it.
+    """
+    if '{frame' in output:
+        return PngSequenceWriter(output)
+    extension = os.path.splitext(output)[1].lower()
+    if extension == '.gif':
+        return GifWriter(output, fps, palette)
+    if extension != '.mp4':
+        raise ValueError(f"Unsupported animation output {output!r}, use .mp4, .gif or a {{frame}} PNG pattern")
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("Writing MP4 needs ffmpeg on the PATH, use .gif or a {frame} PNG pattern instead")
+    return FFmpegWriter(output, width, height, fps)
+
+
+def produce_frames(render: Callable, tasks: Iterable, workers: Optional[int] = None,
+                   initializer: Callable = None, initargs: tuple = ()) -> Iterator[np.ndarray]:
+    """Render tasks in a process pool, yielding frames in task order.
+
+    Tasks are consumed lazily and at most two per worker are in flight, so
+    neither the tasks nor the frames of a long animation are held at once.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield render(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(render, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_frames(frames: Iterable[np.ndarray], writer, hold: int = 1) -> int:
+    """Stream frames to writer, each repeated hold times, and close it; returns the frames written."""
+    count = 0
+    try:
+        for frame in frames:
+            for _ in range(hold):
+                writer.write(frame)
+                count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def sweep_root(fractal: str) -> Tuple[np.ndarray, Callable]:
+    """(depth 0 geometry in the default layout, subdivision kernel taking it one depth further)."""
+    if fractal == "Sierpinski Triangle":
+        return np.array([FractalGenerator.SIERPINSKI_POINTS], dtype=float), sierpinski_subdivide
+    elif fractal == "Cantor Set":
+        return np.array([FractalGenerator.CANTOR_INTERVAL], dtype=float), cantor_subdivide
+    elif fractal == "Koch Snowflake":
+        return np.asarray(FractalGenerator().koch_layout_triangle(), dtype=float), koch_subdivide
+    raise ValueError(f"No depth sweep for {fractal!r}")
+
+
+def vector_frame(task) -> np.ndarray:
+    """Worker: rasterize one depth of a vector fractal from precomputed geometry, or streamed if it is None."""
+    fractal, depth, geometry, palette, width, height, viewport = task
+    generator = FractalGenerator()
+
+    def draw(raster):
+        generator.rasterize_fractal(raster, fractal, depth, palette, geometry)
+
+    # Line widths scale with the image, like the GUI's 800-pixel raster renderer
+    return rasterize(draw, width, height, viewport, 100 * width / 800)
+
+
+# Depth sweep state of a worker: the frame settings, the subdivision kernel and the geometry of every depth built
+_sweep = None
+
+
+def _init_sweep(fractal: str, colors: List[str], width: int, height: int,
+                viewport: Tuple[float, float, float, float]):
+    global _sweep
+    root, subdivide = sweep_root(fractal)
+    _sweep = (fractal, colors, width, height, viewport), subdivide, [root]
+
+
+def sweep_frame(depth: int) -> np.ndarray:
+    """Worker: rasterize one depth of the sweep, subdividing the deepest geometry this worker has built so far."""
+    (fractal, colors, width, height, viewport), subdivide, levels = _sweep
+    while len(levels) <= depth:
+        levels.append(subdivide(levels[-1]))
+    # Koch frames take the outline of their depth, the others every level down to it
+    geometry = levels[depth] if fractal == "Koch Snowflake" else levels[:depth + 1]
+    return vector_frame((fractal, depth, geometry, colors, width, height, viewport))
+
+
+def depth_sweep(fractal: str, depth: int, output: str, palette: str = None, width: int = 800, height: int = 800,
+                fps: float = 24, hold: int = 12, workers: Optional[int] = None) -> int:
+    """Animate a vector fractal growing from depth 0 to depth, holding every depth for hold frames.
+
+    Workers only receive depths; each one builds the geometry itself, one subdivision past the deepest it has.
+    """
+    viewport = fit_viewport(FractalGenerator.VIEWPORTS[fractal], width, height)
+    colors = COLOR_SCHEMES[palette or "Vibrant"]
+    # Unknown fractals fail here rather than in every worker's initializer
+    sweep_root(fractal)
+    writer = open_writer(output, width, height, fps)
+    frames = produce_frames(sweep_frame, range(depth + 1), workers, _init_sweep,
+                            (fractal, colors, width, height, viewport))
+    return write_frames(frames, writer, hold)
+
+
+def zoom_frame(task) -> np.ndarray:
+    """Worker: colour one Mandelbrot view given by a high-precision centre and float64 half extents."""
+    center, half_width, half_height, width, height, max_iter, colors = task
+    if 2 * half_width < FractalGenerator.DEEP_ZOOM_SPAN:
+        iterations, _ = escape_time_perturbation(center, half_width, half_height, width, height, max_iter)
+    else:
+        x, y = float(center[0]), float(center[1])
+        bounds = (x - half_width, x + half_width, y - half_height, y + half_height)
+        iterations, _ = escape_time(complex_grid(bounds, width, height), max_iter)
+    # Grid rows run bottom to top, image rows top to bottom
+    return mandelbrot_palette(colors).map(iterations[::-1])
+
+
+def zoom_tasks(center: Tuple[str, str], zoom: float, frames: int, width: int, height: int, max_iter: int,
+               colors: Optional[List[str]], start: Tuple[float, float, float, float],
+               iter_growth: int = 200) -> Iterator[tuple]:
+    """Views from start to a zoom-times narrower one around center, shrinking by a constant factor per frame.
+
+    The view centre moves with the zoom, so center stays put on screen while the view closes in on it.
+    Every tenfold zoom adds iter_growth iterations to max_iter.
+    """
+    x_min, x_max, y_min, y_max = fit_viewport(start, width, height)
+    half_width, half_height = (x_max - x_min) / 2, (y_max - y_min) / 2
+    dx = (x_min + x_max) / 2 - float(center[0])
+    dy = (y_min + y_max) / 2 - float(center[1])
+    for frame in range(frames):
+        scale = zoom ** (-frame / max(frames - 1, 1))
+        frame_center = offset_point(center, dx * scale, dy * scale, half_width * scale)
+        # Deeper views need more iterations to resolve the boundary
+        frame_iter = max_iter + int(iter_growth * math.log10(1 / scale))
+        yield frame_center, half_width * scale, half_height * scale, width, height, frame_iter, colors
+
+
+def zoom_path(output: str, center: Tuple[str, str], zoom: float, frames: int = 120, width: int = 800,
+              height: int = 800, max_iter: int = 200, palette: str = None, fps: float = 24,
+              workers: Optional[int] = None, start: Tuple[float, float, float, float] = None,
+              iter_growth: int = 200) -> int:
+    """Animate a zoom into the Mandelbrot set from start (the full set by default) by a factor of zoom.
+
+    center may be given as strings to keep digits beyond float64 for deep zooms.
+    """
+    colors = COLOR_SCHEMES[palette] if palette else None
+    # Every frame is coloured from the lookup table, so it is an exact GIF palette
+    writer = open_writer(output, width, height, fps, mandelbrot_palette(colors).table_uint8[:, :3])
+    center = (Decimal(center[0]), Decimal(center[1]))
+    tasks = zoom_tasks(center, zoom, frames, width, height, max_iter, colors,
+                       start or FractalGenerator.MANDELBROT_BOUNDS, iter_growth)
+    return write_frames(produce_frames(zoom_frame, tasks, workers), writer)
+
+
+# Palette cycle state of a worker: lookup table index per pixel, interior mask and the table
+_cycle = None
+
+
+def _init_cycle(index: np.ndarray, interior: np.ndarray, table: np.ndarray):
+    global _cycle
+    _cycle = index, interior, table
+
+
+def cycle_frame(shift: int) -> np.ndarray:
+    """Worker: remap the cached iteration buffer through the lookup table rotated by shift."""
+    index, interior, table = _cycle
+    frame = table[(index + shift) % len(table)]
+    frame[interior] = table[-1]
+    return frame
+
+
+def palette_cycle(output: str, frames: int = 64, width: int = 800, height: int = 800, max_iter: int = 200,
+                  palette: str = None, fps: float = 24, workers: Optional[int] = None,
+                  bounds: Tuple[float, float, float, float] = None) -> int:
+    """Animate the Mandelbrot colours cycling once through the palette, as a seamless loop.
+
+    The iterations are computed once; every frame is a lookup table remap of them.
+    """
+    colors = COLOR_SCHEMES[palette] if palette else None
+    writer = open_writer(output, width, height, fps, mandelbrot_palette(colors).table_uint8[:, :3])
+    workers = workers or os.cpu_count() or 1
+    bounds = fit_viewport(bounds or FractalGenerator.MANDELBROT_BOUNDS, width, height)
+    if workers > 1:
+        iterations, magnitude = escape_time_tiled(bounds, width, height, max_iter, workers)
+    else:
+        iterations, magnitude = escape_time(complex_grid(bounds, width, height), max_iter)
+    interior = iterations[::-1] >= max_iter
+    # Smooth counts, so the bands flow instead of stepping
+    values = smooth_iterations(iterations, magnitude, max_iter)[::-1]
+
+    # Palette there and back again, so the rotation wraps around without a seam
+    table = mandelbrot_palette(colors).table_uint8
+    table = np.concatenate([table, table[::-1]])
+    outside = values[~interior]
+    low, high = (outside.min(), outside.max()) if outside.size else (0.0, 1.0)
+    index = ((values - low) / max(high - low, 1e-12) * (len(table) - 1)).astype(np.int32)
+
+    shifts = (round(frame * len(table) / frames) for frame in range(frames))
+    return write_frames(produce_frames(cycle_frame, shifts, workers, _init_cycle, (index, interior, table)), writer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export fractal animations as MP4, GIF or PNG sequences")
+    parser.add_argument('-o', '--output', required=True, help="output .mp4, .gif or PNG pattern with {frame}")
+    parser.add_argument('--size', type=parse_size, default=(800, 800), help="WIDTHxHEIGHT in pixels")
+    parser.add_argument('--fps', type=float, default=24)
+    parser.add_argument('--palette', choices=list(COLOR_SCHEMES),
+                        help="color scheme (Mandelbrot defaults to its own colours)")
+    parser.add_argument('--workers', type=int, help="parallel render processes (default: all cores)")
+    kinds = parser.add_subparsers(dest='kind', required=True)
+
+    depth = kinds.add_parser('depth', help="a vector fractal growing one depth at a time")
+    depth.add_argument('--fractal', choices=[f for f in FRACTALS if f != "Mandelbrot Set"], default=FRACTALS[0])
+    depth.add_argument('--depth', type=int, default=7, help="last depth")
+    depth.add_argument('--hold', type=int, default=12, help="frames to show each depth for")
+
+    zoom = kinds.add_parser('zoom', help="a zoom into the Mandelbrot set")
+    zoom.add_argument('--center', nargs=2, required=True, metavar=('REAL', 'IMAG'),
+                      help="point to zoom into, as many digits as the zoom needs")
+    zoom.add_argument('--zoom', type=float, default=1e4, help="total magnification")
+    zoom.add_argument('--frames', type=int, default=120)
+    zoom.add_argument('--max-iter', type=int, default=200, help="iterations at the start")
+    zoom.add_argument('--iter-growth', type=int, default=200, help="iterations added per tenfold zoom")
+
+    cycle = kinds.add_parser('palette', help="Mandelbrot colours cycling through the palette")
+    cycle.add_argument('--frames', type=int, default=64)
+    cycle.add_argument('--max-iter', type=int, default=200)
+    cycle.add_argument('--viewport', type=float, nargs=4, metavar=('X_MIN', 'X_MAX', 'Y_MIN', 'Y_MAX'))
+    args = parser.parse_args()
+
+    width, height = args.size
+    if args.kind == 'depth':
+        count = depth_sweep(args.fractal, args.depth, args.output, args.palette, width, height, args.fps,
+                            args.hold, args.workers)
+    elif args.kind == 'zoom':
+        count = zoom_path(args.output, args.center, args.zoom, args.frames, width, height, args.max_iter,
+                          args.palette, args.fps, args.workers, iter_growth=args.iter_growth)
+    else:
+        count = palette_cycle(args.output, args.frames, width, height, args.max_iter, args.palette, args.fps,
+                              args.workers, tuple(args.viewport) if args.viewport else None)
+    print(f"{args.output}: {count} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Headless fractal rendering, as a library and from the command line.
+
+Nothing here touches tkinter or pyplot, so it runs on servers without a
+display. The Mandelbrot set is coloured straight from its iteration buffer;
+the vector fractals are drawn on an off-screen Agg canvas, or with the
+"stream" backend rasterized from chunked geometry that is never held whole,
+which keeps memory flat at depths of 14-16. Outputs ending in .svg are
+always written from the geometry stream.
+
+Examples:
+    python fractal_batch.py --fractal "Mandelbrot Set" --depth 7 --size 1920x1080 -o mandelbrot.png
+    python fractal_batch.py --fractal "Koch Snowflake" --depth 0 1 2 3 4 5 6 --palette Ocean Fire -o "koch_{palette}_{depth}.png"
+    python fractal_batch.py --fractal "Sierpinski Triangle" --depth 15 --backend stream --lod 1 --size 7680x7680 -o sierpinski.png
+    python fractal_batch.py --fractal "Koch Snowflake" --depth 8 -o koch.svg
+    python fractal_batch.py --jobs jobs.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import matplotlib.image as mpimg
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fractal_engine import complex_grid, escape_time
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES, mandelbrot_palette
+from fractal_raster import rasterize, rasterize_to_png
+from fractal_stream import write_svg
+
+FRACTALS = list(FractalGenerator.VIEWPORTS)
+BACKENDS = ['agg', 'stream']
+
+
+class RenderJob(NamedTuple):
+    """One image to render; viewport defaults to FractalGenerator.VIEWPORTS and backend is 'agg' or 'stream'.
+
+    With the stream backend, lod stops subdividing below that many pixels (0 for full depth).
+    """
+    fractal: str
+    depth: int
+    output: str
+    palette: Optional[str] = None
+    width: int = 800
+    height: int = 800
+    viewport: Optional[Tuple[float, float, float, float]] = None
+    max_iter: Optional[int] = None
+    backend: str = 'agg'
+    lod: float = 0.0
+
+
+def fit_viewport(viewport: Tuple[float, float, float, float], width: int, height: int) -> Tuple[float, float, float, float]:
+    """Grow the viewport around its centre so one pixel is square."""
+    x_min, x_max, y_min, y_max = viewport
+    x_span, y_span = x_max - x_min, y_max - y_min
+    if x_span / width > y_span / height:
+        y_span = x_span * height / width
+    else:
+        x_span = y_span * width / height
+    x_mid, y_mid = (x_min + x_max) / 2, (y_min + y_max) / 2
+    return (x_mid - x_span / 2, x_mid + x_span / 2, y_mid - y_span / 2, y_mid + y_span / 2)
+
+
+def render_mandelbrot(job: RenderJob) -> np.ndarray:
+    """(height, width, 4) uint8 image coloured directly from the iteration buffer."""
+    viewport = fit_viewport(job.viewport or FractalGenerator.VIEWPORTS[job.fractal], job.width, job.height)
+    max_iter = job.max_iter or FractalGenerator.default_max_iter(job.depth)
+    iterations, _ = escape_time(complex_grid(viewport, job.width, job.height), max_iter)
+
+    colors = COLOR_SCHEMES[job.palette] if job.palette else None
+    # Grid rows run bottom to top, image rows top to bottom
+    return mandelbrot_palette(colors).map(iterations[::-1])
+
+
+def render_vector(job: RenderJob) -> np.ndarray:
+    """(height, width, 4) uint8 image of a vector fractal drawn on an off-screen Agg canvas."""
+    if job.backend == 'stream':
+        return render_stream(job)
+    dpi = 100
+    figure = Figure(figsize=(job.width / dpi, job.height / dpi), dpi=dpi, facecolor='white')
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+
+    generator = FractalGenerator()
+    palette = COLOR_SCHEMES[job.palette or "Vibrant"]
+    generator.draw_layout(job.fractal, job.depth, ax, palette)
+
+    x_min, x_max, y_min, y_max = fit_viewport(job.viewport or FractalGenerator.VIEWPORTS[job.fractal],
+                                              job.width, job.height)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def render_stream(job: RenderJob, path: Optional[str] = None) -> Optional[np.ndarray]:
+    """Rasterize a vector fractal from its geometry stream, to an array or banded to a PNG file."""
+    generator = FractalGenerator()
+    palette = COLOR_SCHEMES[job.palette or "Vibrant"]
+    viewport = fit_viewport(job.viewport or FractalGenerator.VIEWPORTS[job.fractal], job.width, job.height)
+
+    def draw(raster):
+        generator.rasterize_fractal(raster, job.fractal, job.depth, palette, lod=job.lod)
+
+    if path:
+        rasterize_to_png(path, draw, job.width, job.height, viewport)
+        return None
+    return rasterize(draw, job.width, job.height, viewport)
+
+
+def render_svg(job: RenderJob):
+    """Write a vector fractal to job.output as SVG straight from its geometry stream."""
+    generator = FractalGenerator()
+    palette = COLOR_SCHEMES[job.palette or "Vibrant"]
+    viewport = fit_viewport(job.viewport or FractalGenerator.VIEWPORTS[job.fractal], job.width, job.height)
+    write_svg(job.output, generator.geometry_chunks(job.fractal, job.depth),
+              generator.level_styles(job.fractal, job.depth, palette), viewport, job.width)
+
+
+def check_job(job: RenderJob):
+    if job.fractal not in FractalGenerator.VIEWPORTS:
+        raise ValueError(f"Unknown fractal {job.fractal!r}, expected one of {FRACTALS}")
+    if job.backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {job.backend!r}, expected one of {BACKENDS}")
+
+
+def render_image(job: RenderJob) -> np.ndarray:
+    """Render a job to a (height, width, 4) uint8 RGBA array."""
+    check_job(job)
+    if job.fractal == "Mandelbrot Set":
+        return render_mandelbrot(job)
+    return render_vector(job)
+
+
+def render_to_file(job: RenderJob) -> str:
+    """Render a job and write it as a PNG, or SVG for .svg outputs, returning the output path."""
+    check_job(job)
+    if job.output.lower().endswith('.svg'):
+        if job.fractal == "Mandelbrot Set":
+            raise ValueError("The Mandelbrot set cannot be written as SVG")
+        render_svg(job)
+    elif job.backend == 'stream' and job.fractal != "Mandelbrot Set":
+        # Banded, so neither the geometry nor the full image is ever in memory
+        render_stream(job, job.output)
+    else:
+        mpimg.imsave(job.output, render_image(job), format='png')
+    return job.output
+
+
+def render_batch(jobs: Iterable[RenderJob], workers: Optional[int] = None) -> List[str]:
+    """Render many jobs in a process pool, returning output paths in job order."""
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [render_to_file(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_to_file, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height or width)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render fractals to PNG without a display")
+    parser.add_argument('--fractal', choices=FRACTALS, default=FRACTALS[0])
+    parser.add_argument('--depth', type=int, nargs='+', default=[3], help="one image per depth")
+    parser.add_argument('--palette', choices=list(COLOR_SCHEMES), nargs='+', default=[None],
+                        help="one image per color scheme (Mandelbrot defaults to its own colours)")
+    parser.add_argument('--size', type=parse_size, default=(800, 800), help="WIDTHxHEIGHT in pixels")
+    parser.add_argument('--viewport', type=float, nargs=4, metavar=('X_MIN', 'X_MAX', 'Y_MIN', 'Y_MAX'))
+    parser.add_argument('--max-iter', type=int, help="Mandelbrot iterations (default from depth)")
+    parser.add_argument('--backend', choices=BACKENDS, default='agg',
+                        help="'stream' rasterizes chunked geometry with flat memory, for very deep vector fractals")
+    parser.add_argument('--lod', type=float, default=0.0,
+                        help="stream backend: stop subdividing below this many pixels (default: full depth)")
+    parser.add_argument('-o', '--output', default="{fractal}_depth_{depth}.png",
+                        help="output path, may use {fractal}, {depth} and {palette}")
+    parser.add_argument('--jobs', help="JSON lines file of RenderJob fields, replaces the options above")
+    parser.add_argument('--workers', type=int, help="parallel render processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.jobs:
+        with open(args.jobs) as f:
+            jobs = [RenderJob(**json.loads(line)) for line in f if line.strip()]
+    else:
+        width, height = args.size
+        jobs = [
+            RenderJob(args.fractal, depth,
+                      args.output.format(fractal=args.fractal.lower().replace(' ', '_'), depth=depth,
+                                         palette=(palette or 'default').lower()),
+                      palette, width, height, tuple(args.viewport) if args.viewport else None, args.max_iter,
+                      args.backend, args.lod)
+            for depth in args.depth
+            for palette in args.palette
+        ]
+
+    for path in render_batch(jobs, args.workers):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Benchmarks for the fractal kernels and drawing methods.
+
+By default this times the multi-core Mandelbrot renderer against the number of
+workers. With --suite it sweeps the FractalGenerator drawing methods over
+depth and image size on an off-screen Agg canvas, splitting each render into
+geometry, colour, artist and render stages, and can write the results as JSON
+and compare them against a stored baseline.
+
+Run `python fractal_bench.py --help` for the available options.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fractal_engine import escape_time_tiled
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES
+
+STAGES = ['geometry', 'colour', 'artists', 'render']
+SUITE_DEPTHS = {
+    "Sierpinski Triangle": [2, 4, 6, 8, 10],
+    "Koch Snowflake": [2, 4, 6, 8],
+    "Cantor Set": [1, 3, 5, 7],
+    "Mandelbrot Set": [1, 3, 5, 7],
+}
+SUITE_SIZES = [400, 800]
+# Timings below this many seconds are too noisy to call a regression
+MIN_SECONDS = 0.005
+
+
+class StageTimer:
+    """Wall time per named stage, accumulated over every block timed with stage()."""
+
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.times.values())
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.times.items())
+
+
+def mandelbrot_scaling(size: int = 2000, max_iter: int = 200, workers: List[int] = None,
+                       tile_rows: int = 32, repeat: int = 1) -> List[dict]:
+    """Time escape_time_tiled on a size x size grid for each worker count."""
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    bounds = (-2.5, 1.5, -2, 2)
+
+    results = []
+    for count in workers:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            escape_time_tiled(bounds, size, size, max_iter, workers=count, tile_rows=tile_rows)
+            best = min(best, time.perf_counter() - start)
+        results.append({'workers': count, 'seconds': best})
+
+    baseline = results[0]['seconds'] * results[0]['workers']
+    for result in results:
+        result['speedup'] = baseline / result['seconds']
+        result['efficiency'] = result['speedup'] / result['workers']
+    return results
+
+
+def primitive_count(fractal: str, depth: int, size: int) -> int:
+    """Triangles, segments, intervals or pixels a render draws."""
+    if fractal == "Sierpinski Triangle":
+        return (3 ** (depth + 1) - 1) // 2
+    if fractal == "Koch Snowflake":
+        return 3 * 4 ** depth
+    if fractal == "Cantor Set":
+        return 2 ** (depth + 1) - 1
+    return size * size
+
+
+def render_case(fractal: str, depth: int, size: int, timer: Optional[StageTimer] = None,
+                palette: str = "Vibrant") -> int:
+    """Draw one fractal as the GUI does on a size x size Agg canvas, returning its artist count."""
+    figure = Figure(figsize=(size / 100, size / 100), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    generator = FractalGenerator()
+    generator.timer = timer
+    colors = COLOR_SCHEMES[palette]
+
+    if fractal == "Mandelbrot Set":
+        generator.mandelbrot_set(ax, FractalGenerator.default_max_iter(depth), size, size)
+    else:
+        generator.draw_layout(fractal, depth, ax, colors)
+
+    with generator.stage('render'):
+        canvas.draw()
+    return len(ax.collections) + len(ax.lines) + len(ax.patches) + len(ax.images)
+
+
+def benchmark_case(fractal: str, depth: int, size: int, repeat: int = 1) -> dict:
+    """Stage timings of the fastest of `repeat` renders, plus peak traced memory of one more.
+
+    Memory is traced in a separate run, since tracemalloc slows allocation-heavy code down.
+    """
+    best = None
+    for _ in range(repeat):
+        timer = StageTimer()
+        artists = render_case(fractal, depth, size, timer)
+        if best is None or timer.total < best.total:
+            best = timer
+
+    tracemalloc.start()
+    try:
+        render_case(fractal, depth, size)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {'fractal': fractal, 'depth': depth, 'size': size}
+    if fractal == "Mandelbrot Set":
+        result['max_iter'] = FractalGenerator.default_max_iter(depth)
+    result.update({
+        'seconds': best.total,
+        'stages': {name: best.times.get(name, 0.0) for name in STAGES},
+        'peak_bytes': peak,
+        'artists': artists,
+        'primitives': primitive_count(fractal, depth, size),
+    })
+    return result
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def run_suite(fractals: List[str] = None, depths: List[int] = None, sizes: List[int] = None,
+              repeat: int = 1) -> dict:
+    """Benchmark every fractal at each depth (default SUITE_DEPTHS) and image size."""
+    fractals = fractals or list(SUITE_DEPTHS)
+    sizes = sizes or SUITE_SIZES
+    # Warm up font and colormap caches so they aren't charged to the first case
+    render_case("Cantor Set", 1, 100)
+
+    results = [benchmark_case(fractal, depth, size, repeat)
+               for fractal in fractals
+               for depth in (depths or SUITE_DEPTHS[fractal])
+               for size in sizes]
+    return {'environment': environment(), 'results': results}
+
+
+def case_key(result: dict) -> Tuple[str, int, int]:
+    return result['fractal'], result['depth'], result['size']
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float = 0.2) -> List[dict]:
+    """Time and memory ratios against the matching baseline cases, flagging those worse than 1 + tolerance."""
+    previous = {case_key(result): result for result in baseline}
+    rows = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        time_ratio = result['seconds'] / max(before['seconds'], 1e-9)
+        memory_ratio = result['peak_bytes'] / max(before['peak_bytes'], 1)
+        slower = time_ratio > 1 + tolerance and result['seconds'] > MIN_SECONDS
+        rows.append({'fractal': result['fractal'], 'depth': result['depth'], 'size': result['size'],
+                     'time_ratio': time_ratio, 'memory_ratio': memory_ratio,
+                     'regression': slower or memory_ratio > 1 + tolerance})
+    return rows
+
+
+def print_suite(results: List[dict]):
+    print(f"{'fractal':<20} {'depth':>5} {'size':>5} {'seconds':>8} "
+          + " ".join(f"{name:>8}" for name in STAGES) + f" {'peak MB':>8} {'artists':>7} {'primitives':>10}")
+    for result in results:
+        stages = " ".join(f"{result['stages'][name]:>8.3f}" for name in STAGES)
+        print(f"{result['fractal']:<20} {result['depth']:>5} {result['size']:>5} {result['seconds']:>8.3f} {stages} "
+              f"{result['peak_bytes'] / 1e6:>8.1f} {result['artists']:>7} {result['primitives']:>10}")
+
+
+def print_comparison(rows: List[dict]):
+    print(f"{'fractal':<20} {'depth':>5} {'size':>5} {'time':>7} {'memory':>7}")
+    for row in rows:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['fractal']:<20} {row['depth']:>5} {row['size']:>5} "
+              f"{row['time_ratio']:>6.2f}x {row['memory_ratio']:>6.2f}x{flag}")
+
+
+def suite_main(args) -> int:
+    report = run_suite(args.fractal, args.depths, args.sizes, args.repeat)
+    print_suite(report['results'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    rows = compare(report['results'], baseline, args.tolerance)
+    print(f"\nAgainst {args.baseline} (tolerance {args.tolerance:.0%}):")
+    print_comparison(rows)
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fractal kernel benchmarks")
+    parser.add_argument('--size', type=int, default=2000, help="grid width and height in pixels")
+    parser.add_argument('--max-iter', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', help="worker counts to compare (default: 1, 2, 4, ... cores)")
+    parser.add_argument('--tile-rows', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=1, help="keep the best of this many runs")
+    suite = parser.add_argument_group("drawing suite")
+    suite.add_argument('--suite', action='store_true', help="benchmark the drawing methods instead of worker scaling")
+    suite.add_argument('--fractal', choices=list(SUITE_DEPTHS), nargs='+', help="fractals to run (default: all)")
+    suite.add_argument('--depths', type=int, nargs='+', help="depths to sweep (default: per fractal)")
+    suite.add_argument('--sizes', type=int, nargs='+', help=f"image sizes in pixels (default: {SUITE_SIZES})")
+    suite.add_argument('--json', help="write the results to this JSON file")
+    suite.add_argument('--baseline', help="JSON file from an earlier --json run to compare against")
+    suite.add_argument('--tolerance', type=float, default=0.2,
+                       help="relative slowdown or memory growth counted as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    if args.suite:
+        sys.exit(suite_main(args))
+
+    print(f"Mandelbrot {args.size}x{args.size}, max_iter={args.max_iter}, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'efficiency':>11}")
+    for result in mandelbrot_scaling(args.size, args.max_iter, args.workers, args.tile_rows, args.repeat):
+        print(f"{result['workers']:>8} {result['seconds']:>9.3f} {result['speedup']:>8.2f} {result['efficiency']:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
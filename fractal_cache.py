@@ -0,0 +1,125 @@
+"""Memory-bounded cache of computed fractal geometry and Mandelbrot iteration buffers.
+
+Geometry does not depend on the colour scheme, so recolouring or returning to a
+depth that was already shown only needs a lookup. Each depth is built from the
+cached depth - 1 result with a single subdivision step. Cached arrays are
+shared between callers and stored read-only.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+from fractal_engine import cantor_subdivide, koch_subdivide, sierpinski_subdivide
+
+
+def _nbytes(value) -> int:
+    """Memory held by the arrays inside a cached value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+class GeometryCache:
+    """LRU cache keyed by (fractal, depth, viewport, resolution) tuples, bounded by array bytes."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The render worker fills the cache while the Tk thread reads stats
+        self.lock = threading.RLock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """Return the cached value for key, calling compute() and storing the result on a miss."""
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value):
+        """Store a value, evicting least recently used entries until it fits."""
+        size = _nbytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= _nbytes(self.entries.pop(key))
+            # Values larger than the whole budget are returned but not kept
+            if size > self.max_bytes:
+                return
+            while self.entries and self.bytes + size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= _nbytes(evicted)
+                self.evictions += 1
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self.entries[key] = value
+            self.bytes += size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and memory use, for tuning max_bytes."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def sierpinski_level(self, points: Sequence[Tuple[float, float]], level: int) -> np.ndarray:
+        """(3**level, 3, 2) triangles of one subdivision level."""
+        points = tuple(map(tuple, points))
+        if level == 0:
+            return self.get_or_compute(('Sierpinski Triangle', points, 0),
+                                       lambda: np.asarray(points, dtype=float).reshape(1, 3, 2))
+        return self.get_or_compute(('Sierpinski Triangle', points, level),
+                                   lambda: sierpinski_subdivide(self.sierpinski_level(points, level - 1)))
+
+    def sierpinski_levels(self, points: Sequence[Tuple[float, float]], depth: int) -> List[np.ndarray]:
+        """Cached equivalent of fractal_engine.sierpinski_levels."""
+        return [self.sierpinski_level(points, level) for level in range(depth + 1)]
+
+    def koch_polyline(self, points: Sequence[Tuple[float, float]], depth: int) -> np.ndarray:
+        """Cached equivalent of fractal_engine.koch_polyline."""
+        points = tuple(map(tuple, points))
+        if depth == 0:
+            return self.get_or_compute(('Koch Snowflake', points, 0), lambda: np.asarray(points, dtype=float))
+        return self.get_or_compute(('Koch Snowflake', points, depth),
+                                   lambda: koch_subdivide(self.koch_polyline(points, depth - 1)))
+
+    def cantor_level(self, intervals: Sequence[Tuple[float, float]], level: int) -> np.ndarray:
+        """(n * 2**level, 2) intervals of one level."""
+        intervals = tuple(map(tuple, intervals))
+        if level == 0:
+            return self.get_or_compute(('Cantor Set', intervals, 0),
+                                       lambda: np.asarray(intervals, dtype=float).reshape(-1, 2))
+        return self.get_or_compute(('Cantor Set', intervals, level),
+                                   lambda: cantor_subdivide(self.cantor_level(intervals, level - 1)))
+
+    def cantor_levels(self, intervals: Sequence[Tuple[float, float]], depth: int) -> List[np.ndarray]:
+        """Cached equivalent of fractal_engine.cantor_levels."""
+        return [self.cantor_level(intervals, level) for level in range(depth + 1)]
+
+    def mandelbrot_iterations(self, key: Hashable, compute: Callable) -> np.ndarray:
+        """Iteration buffer for key, normally (bounds, origin, max_iter, width, height)."""
+        return self.get_or_compute(('Mandelbrot Set',) + tuple(key), compute)
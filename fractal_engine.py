@@ -0,0 +1,323 @@
+"""Vectorised geometry kernels used by FractalGenerator.
+
+Everything in this module works on plain NumPy arrays and never touches
+matplotlib or tkinter, so it can be reused by the GUI, worker processes
+and headless tools alike.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from multiprocessing import shared_memory
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Union
+
+
+def sierpinski_subdivide(triangles: np.ndarray) -> np.ndarray:
+    """Split every triangle of an (N, 3, 2) array into its three corner triangles, (3N, 3, 2)."""
+    p0, p1, p2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    m01 = (p0 + p1) / 2
+    m02 = (p0 + p2) / 2
+    m12 = (p1 + p2) / 2
+
+    # Corner triangles in the same vertex order as the recursive version,
+    # children of one parent stay contiguous after the reshape
+    children = np.stack([
+        np.stack([p0, m01, m02], axis=1),
+        np.stack([p1, m01, m12], axis=1),
+        np.stack([p2, m02, m12], axis=1),
+    ], axis=1)
+    return children.reshape(-1, 3, 2)
+
+
+def sierpinski_levels(points: Sequence[Tuple[float, float]], depth: int) -> List[np.ndarray]:
+    """Return one (3**k, 3, 2) vertex array per subdivision level, root level first."""
+    levels = [np.asarray(points, dtype=float).reshape(1, 3, 2)]
+    for _ in range(depth):
+        levels.append(sierpinski_subdivide(levels[-1]))
+    return levels
+
+
+def _koch_bump(start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The three new points of each (start, end) segment: first third, peak and second third."""
+    third = (end - start) / 3
+    first = start + third
+    second = start + 2 * third
+    # Peak of the equilateral bump: midpoint of the middle third plus its height
+    normal = np.stack([-third[:, 1], third[:, 0]], axis=1)
+    peak = (first + second) / 2 + normal * (np.sqrt(3) / 2)
+    return first, peak, second
+
+
+def koch_subdivide(vertices: np.ndarray) -> np.ndarray:
+    """Replace every segment of an (n + 1, 2) polyline by four, returning (4n + 1, 2) vertices.
+
+    Each segment bends out to the left of its direction of travel.
+    """
+    start = vertices[:-1]
+    first, peak, second = _koch_bump(start, vertices[1:])
+
+    refined = np.empty((4 * len(start) + 1, 2))
+    refined[0:-1:4] = start
+    refined[1::4] = first
+    refined[2::4] = peak
+    refined[3::4] = second
+    refined[-1] = vertices[-1]
+    return refined
+
+
+def koch_subdivide_segments(segments: np.ndarray) -> np.ndarray:
+    """Replace every segment of an (N, 2, 2) array by its four Koch segments, (4N, 2, 2).
+
+    Same geometry and order as koch_subdivide on the polyline the segments form.
+    """
+    start, end = segments[:, 0], segments[:, 1]
+    first, peak, second = _koch_bump(start, end)
+    points = np.stack([start, first, peak, second, end], axis=1)
+    return np.stack([points[:, :-1], points[:, 1:]], axis=2).reshape(-1, 2, 2)
+
+
+def koch_polyline(points: Sequence[Tuple[float, float]], depth: int) -> np.ndarray:
+    """Apply `depth` Koch subdivisions to a polyline and return the (4**depth * n + 1, 2) vertices.
+
+    Pass a closed polyline (last point equal to the first) for a snowflake.
+    """
+    vertices = np.asarray(points, dtype=float)
+    for _ in range(depth):
+        vertices = koch_subdivide(vertices)
+    return vertices
+
+
+def cantor_subdivide(intervals: np.ndarray) -> np.ndarray:
+    """Remove the middle third of every (start, end) row, returning twice as many intervals."""
+    start, end = intervals[:, 0], intervals[:, 1]
+    third = (end - start) / 3
+    # Keep [start, start + 1/3] and [start + 2/3, end] of every interval, in order
+    return np.stack([
+        np.stack([start, start + third], axis=1),
+        np.stack([start + 2 * third, end], axis=1),
+    ], axis=1).reshape(-1, 2)
+
+
+def cantor_levels(intervals: Sequence[Tuple[float, float]], depth: int) -> List[np.ndarray]:
+    """Return one (n * 2**k, 2) array of (start, end) intervals per level, root level first."""
+    levels = [np.asarray(intervals, dtype=float).reshape(-1, 2)]
+    for _ in range(depth):
+        levels.append(cantor_subdivide(levels[-1]))
+    return levels
+
+
+def complex_grid(bounds: Tuple[float, float, float, float], width: int, height: int) -> np.ndarray:
+    """Return a (height, width) grid of complex points spanning (x_min, x_max, y_min, y_max)."""
+    x_min, x_max, y_min, y_max = bounds
+    x = np.linspace(x_min, x_max, width)
+    y = np.linspace(y_min, y_max, height)
+    return x[np.newaxis, :] + 1j * y[:, np.newaxis]
+
+
+def escape_time(c: np.ndarray, max_iter: int, bailout: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Iterate z -> z**2 + c and return (escape iteration, |z| at escape) for every point.
+
+    Points that never leave the bailout radius get `max_iter` iterations and a
+    magnitude of 0. Only the still-bounded points are iterated: they are kept
+    packed at the front of preallocated buffers and compacted whenever some escape.
+    """
+    c = np.asarray(c, dtype=complex)
+    shape = c.shape
+    count = c.size
+
+    iterations = np.full(count, max_iter, dtype=int)
+    magnitude = np.zeros(count)
+
+    z = np.zeros(count, dtype=complex)
+    points = c.ravel().copy()
+    index = np.arange(count)
+    radius2 = np.empty(count)
+    scratch = np.empty(count)
+    bailout2 = bailout * bailout
+    live = count
+
+    for i in range(1, max_iter):
+        if live == 0:
+            break
+
+        z_live = z[:live]
+        np.multiply(z_live, z_live, out=z_live)
+        z_live += points[:live]
+
+        # |z|^2 without the square root
+        r2 = radius2[:live]
+        np.multiply(z_live.real, z_live.real, out=r2)
+        tmp = scratch[:live]
+        np.multiply(z_live.imag, z_live.imag, out=tmp)
+        r2 += tmp
+
+        escaped = r2 > bailout2
+        if not escaped.any():
+            continue
+
+        escaped_index = index[:live][escaped]
+        iterations[escaped_index] = i
+        magnitude[escaped_index] = np.sqrt(r2[escaped])
+
+        keep = ~escaped
+        remaining = live - len(escaped_index)
+        z[:remaining] = z_live[keep]
+        points[:remaining] = points[:live][keep]
+        index[:remaining] = index[:live][keep]
+        live = remaining
+
+    return iterations.reshape(shape), magnitude.reshape(shape)
+
+
+def smooth_iterations(iterations: np.ndarray, magnitude: np.ndarray, max_iter: int,
+                      bailout: float = 2.0) -> np.ndarray:
+    """Turn escape counts and final |z| into a continuous iteration count."""
+    smooth = iterations.astype(float)
+    escaped = iterations < max_iter
+    # log|z| / log(bailout) lies in (1, 2] at escape, so the fractional part stays in [0, 1)
+    ratio = np.log(magnitude[escaped]) / np.log(bailout)
+    smooth[escaped] -= np.log2(ratio)
+    return smooth
+
+
+def _escape_time_rows(shm_name: str, bounds: Tuple[float, float, float, float], width: int, height: int,
+                      row_start: int, row_stop: int, max_iter: int, bailout: float):
+    """Worker: compute one block of rows and write it straight into the shared output buffers."""
+    # Pool workers share the parent's resource tracker, so attaching here does not
+    # take ownership of the block away from escape_time_tiled
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        iterations = np.ndarray((height, width), dtype=int, buffer=shm.buf)
+        magnitude = np.ndarray((height, width), dtype=float, buffer=shm.buf, offset=iterations.nbytes)
+
+        x_min, x_max, y_min, y_max = bounds
+        x = np.linspace(x_min, x_max, width)
+        y = np.linspace(y_min, y_max, height)[row_start:row_stop]
+        c = x[np.newaxis, :] + 1j * y[:, np.newaxis]
+
+        iterations[row_start:row_stop], magnitude[row_start:row_stop] = escape_time(c, max_iter, bailout)
+        # Drop the views before closing, the mmap refuses to close while they exist
+        del iterations, magnitude
+    finally:
+        shm.close()
+
+
+def escape_time_tiled(bounds: Tuple[float, float, float, float], width: int, height: int, max_iter: int,
+                      workers: Optional[int] = None, tile_rows: int = 64,
+                      bailout: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Multi-core escape_time over a grid, split into blocks of `tile_rows` rows.
+
+    Blocks are computed in a process pool and written directly into a shared
+    memory buffer, so only the block coordinates are pickled. Returns the same
+    (iterations, magnitude) pair as escape_time on complex_grid(bounds, width, height).
+    """
+    workers = workers or os.cpu_count() or 1
+    itemsize = np.dtype(int).itemsize + np.dtype(float).itemsize
+    shm = shared_memory.SharedMemory(create=True, size=width * height * itemsize)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_escape_time_rows, shm.name, bounds, width, height,
+                            start, min(start + tile_rows, height), max_iter, bailout)
+                for start in range(0, height, tile_rows)
+            ]
+            for future in futures:
+                # Re-raise any worker error
+                future.result()
+
+        iterations = np.ndarray((height, width), dtype=int, buffer=shm.buf).copy()
+        magnitude = np.ndarray((height, width), dtype=float, buffer=shm.buf, offset=iterations.nbytes).copy()
+        return iterations, magnitude
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def reference_orbit(center: Tuple[Union[str, Decimal], Union[str, Decimal]], max_iter: int,
+                    digits: int, bailout: float = 2.0) -> np.ndarray:
+    """Iterate the reference point in `digits`-digit decimal arithmetic and return Z_0..Z_n as complex128.
+
+    Stops early once the orbit leaves the bailout radius; the stored values are
+    always small enough for float64 even though the point itself is not.
+    """
+    with localcontext() as context:
+        context.prec = digits
+        c_re, c_im = Decimal(center[0]), Decimal(center[1])
+        z_re = z_im = Decimal(0)
+        bailout2 = Decimal(bailout * bailout)
+
+        orbit = [0j]
+        for _ in range(max_iter):
+            z_re, z_im = z_re * z_re - z_im * z_im + c_re, 2 * z_re * z_im + c_im
+            orbit.append(complex(float(z_re), float(z_im)))
+            if z_re * z_re + z_im * z_im > bailout2:
+                break
+
+    return np.array(orbit)
+
+
+def escape_time_perturbation(center: Tuple[Union[str, Decimal], Union[str, Decimal]], half_width: float,
+                             half_height: float, width: int, height: int, max_iter: int,
+                             bailout: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Deep-zoom escape_time for a view given as a high-precision centre and float64 half extents.
+
+    Only the reference orbit of the centre is computed at high precision. Every
+    pixel iterates its float64 offset from that orbit,
+    dz -> 2 Z_m dz + dz**2 + dc, and is rebased onto the start of the orbit
+    (dz = Z_m + dz, m = 0) whenever its full value gets smaller than its delta
+    or the orbit runs out. That rebasing is what keeps pixels from glitching
+    once they drift away from the reference. Returns the same (iterations,
+    magnitude) pair as escape_time on the equivalent grid.
+    """
+    # Enough digits to resolve one pixel at this scale, plus headroom for the orbit
+    pixel = min(half_width / max(width - 1, 1), half_height / max(height - 1, 1)) or half_width
+    digits = max(30, int(-np.log10(pixel)) + 20)
+    orbit = reference_orbit(center, max_iter, digits, bailout)
+    last = len(orbit) - 1
+
+    x = np.linspace(-half_width, half_width, width)
+    y = np.linspace(-half_height, half_height, height)
+    dc = (x[np.newaxis, :] + 1j * y[:, np.newaxis]).ravel()
+    count = dc.size
+
+    iterations = np.full(count, max_iter, dtype=int)
+    magnitude = np.zeros(count)
+
+    dz = np.zeros(count, dtype=complex)
+    ref_index = np.zeros(count, dtype=int)
+    index = np.arange(count)
+    bailout2 = bailout * bailout
+
+    for i in range(1, max_iter):
+        if len(index) == 0:
+            break
+
+        reference = orbit[ref_index]
+        dz = (2 * reference + dz) * dz + dc
+        ref_index += 1
+        z = orbit[ref_index] + dz
+        r2 = z.real * z.real + z.imag * z.imag
+
+        escaped = r2 > bailout2
+        if escaped.any():
+            iterations[index[escaped]] = i
+            magnitude[index[escaped]] = np.sqrt(r2[escaped])
+            keep = ~escaped
+            index, dz, dc, ref_index, z, r2 = index[keep], dz[keep], dc[keep], ref_index[keep], z[keep], r2[keep]
+
+        # Rebase glitching pixels and those that reached the end of the reference orbit
+        rebase = (r2 < dz.real * dz.real + dz.imag * dz.imag) | (ref_index == last)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            ref_index[rebase] = 0
+
+    return iterations.reshape(height, width), magnitude.reshape(height, width)
+
+
+def offset_point(origin: Tuple[Union[str, Decimal], Union[str, Decimal]], dx: float, dy: float,
+                 scale: float) -> Tuple[Decimal, Decimal]:
+    """Add float64 offsets to a high-precision point, keeping enough digits to resolve `scale`."""
+    with localcontext() as context:
+        context.prec = max(30, int(-np.log10(scale)) + 40)
+        return Decimal(origin[0]) + Decimal(dx), Decimal(origin[1]) + Decimal(dy)
@@ -0,0 +1,378 @@
+import numpy as np
+import math
+from contextlib import nullcontext
+from decimal import Decimal
+from typing import Dict, Iterator, List, Tuple
+from matplotlib.collections import PathCollection
+from matplotlib.colors import to_rgb
+from matplotlib.path import Path
+from matplotlib.patches import Polygon
+
+from fractal_engine import (cantor_levels, complex_grid, escape_time, escape_time_perturbation, escape_time_tiled, koch_polyline,
+                            offset_point, sierpinski_levels, smooth_iterations)
+from fractal_palette import get_palette, mandelbrot_palette
+from fractal_raster import Rasterizer
+from fractal_stream import (CHUNK_SIZE, Chunk, LevelStyle, View, cantor_chunks, koch_chunks, rasterize_chunks,
+                            sierpinski_chunks)
+
+class FractalGenerator:
+    # Visible region (x_min, x_max, y_min, y_max) for each fractal at its default size
+    VIEWPORTS = {
+        "Sierpinski Triangle": (-240, 240, -240, 240),
+        "Koch Snowflake": (-200, 200, -200, 200),
+        "Cantor Set": (-250, 250, -200, 150),
+        "Mandelbrot Set": (-2.5, 1.5, -2, 2),
+    }
+    # Default layouts inside those viewports: the Sierpinski corners, the Koch centre and side
+    # length, and the Cantor interval with the height of its top level
+    SIERPINSKI_POINTS = ((-200, -200), (0, 200), (200, -200))
+    KOCH_CENTER = (0, 0)
+    KOCH_SIZE = 300
+    CANTOR_INTERVAL = (-200, 200)
+    CANTOR_Y = 100
+    # Views narrower than this are iterated with the perturbation kernel around a high-precision origin.
+    # From about this span down, float64 rounding of the pixel grid changes iteration counts near the boundary
+    DEEP_ZOOM_SPAN = 1e-7
+    
+    @staticmethod
+    def default_max_iter(depth: int) -> int:
+        """Mandelbrot iterations for a depth slider value, 20-400 over its range."""
+        return max(20, depth * 50 + 50)
+    
+    def __init__(self):
+        self.canvas = None
+        self.figure = None
+        # Optional fractal_bench.StageTimer, splits the drawing methods into timed stages
+        self.timer = None
+        
+    def stage(self, name: str):
+        """Context manager timing a block as stage `name` of the attached timer, if any."""
+        return self.timer.stage(name) if self.timer is not None else nullcontext()
+        
+    def sierpinski_triangle(self, points: List[Tuple[float, float]], depth: int, ax, palette: List[str], max_depth: int = 7,
+                            levels: List[np.ndarray] = None):
+        """Generate Sierpinski triangle fractal with gradient colors as a single collection.
+        
+        Pass levels from sierpinski_levels to draw geometry that was computed elsewhere.
+        """
+        if levels is None:
+            with self.stage('geometry'):
+                levels = sierpinski_levels(points, depth)
+        with self.stage('colour'):
+            face_colors, edge_colors, linewidths = self.sierpinski_style(depth, len(levels), palette, max_depth)
+        
+        # One compound path per level: triangles of a level never overlap, so this
+        # fills exactly like separate patches without one Path object per triangle
+        with self.stage('artists'):
+            paths = [self.triangles_to_path(triangles) for triangles in levels]
+            collection = PathCollection(paths, facecolors=face_colors, edgecolors=edge_colors,
+                                        linewidths=linewidths)
+            ax.add_collection(collection)
+        return collection
+    
+    def sierpinski_style(self, depth: int, level_count: int, palette: List[str], max_depth: int = 7):
+        """Per-level RGBA face colours, RGBA edge colours and edge widths of a Sierpinski triangle."""
+        # Colour and alpha fade with the levels still below each one
+        remaining = depth - np.arange(level_count)
+        alphas = 0.9 - (remaining / max_depth) * 0.3
+        face_colors = get_palette(palette).rgba(remaining / max_depth)
+        face_colors[:, 3] = alphas
+        edge_colors = np.zeros((level_count, 4))
+        edge_colors[:, 3] = alphas
+        # Thin the outlines past depth 7 so deep levels don't drown in black edges
+        linewidths = 0.5 / 2.0 ** np.maximum(0, np.arange(level_count) - 7)
+        return face_colors, edge_colors, linewidths
+    
+    def triangles_to_path(self, triangles: np.ndarray) -> Path:
+        """Pack an (N, 3, 2) vertex array into one compound closed Path."""
+        closed = np.concatenate([triangles, triangles[:, :1]], axis=1).reshape(-1, 2)
+        codes = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], len(triangles))
+        return Path(closed, codes.astype(Path.code_type))
+    
+    def koch_snowflake_triangle(self, center: Tuple[float, float], size: float) -> List[Tuple[float, float]]:
+        """Closed equilateral triangle the Koch snowflake starts from."""
+        # Calculate the three vertices of the initial triangle
+        height = size * math.sqrt(3) / 2
+        
+        # Vertices of equilateral triangle
+        v1 = (center[0], center[1] + 2*height/3)
+        v2 = (center[0] - size/2, center[1] - height/3)
+        v3 = (center[0] + size/2, center[1] - height/3)
+        return [v1, v2, v3, v1]
+    
+    def koch_snowflake_vertices(self, center: Tuple[float, float], size: float, depth: int) -> np.ndarray:
+        """Closed vertex sequence of the Koch snowflake outline."""
+        # Subdivide all three sides at once
+        return koch_polyline(self.koch_snowflake_triangle(center, size), depth)
+    
+    def koch_snowflake(self, center: Tuple[float, float], size: float, depth: int, ax, palette: List[str],
+                       vertices: np.ndarray = None):
+        """Generate Koch snowflake fractal with gradient colors."""
+        if vertices is None:
+            with self.stage('geometry'):
+                vertices = self.koch_snowflake_vertices(center, size, depth)
+        
+        with self.stage('colour'):
+            color = self.create_gradient_color(palette, min(depth, 7), 7)
+        
+        with self.stage('artists'):
+            if depth == 0:
+                # Base case: draw simple triangle
+                triangle = Polygon(vertices[:-1], fill=False, edgecolor=color, linewidth=2, alpha=0.9)
+                ax.add_patch(triangle)
+            else:
+                # Draw the whole outline as one line
+                self.draw_koch_polyline(vertices, ax, color, 7)
+    
+    def koch_curve_proper(self, start: Tuple[float, float], end: Tuple[float, float], depth: int, ax, color: str, max_depth: int = 7):
+        """Proper Koch curve implementation following the mathematical definition."""
+        vertices = koch_polyline([start, end], depth)
+        self.draw_koch_polyline(vertices, ax, color, max_depth)
+    
+    def draw_koch_polyline(self, vertices: np.ndarray, ax, color: str, max_depth: int = 7):
+        """Draw a Koch vertex sequence as a single Line2D with the leaf segment style."""
+        ax.plot(vertices[:, 0], vertices[:, 1], color=color, linewidth=self.koch_linewidth(max_depth), alpha=0.9)
+    
+    def koch_linewidth(self, max_depth: int = 7) -> float:
+        """Line width of the leaf Koch segments."""
+        linewidth = 3 - max_depth * 0.2
+        return max(0.5, linewidth)
+    
+    def cantor_set_proper(self, intervals: List[Tuple[float, float]], depth: int, ax, color: str, y_pos: float, max_depth: int = 7,
+                          levels: List[np.ndarray] = None):
+        """Proper Cantor set implementation following the mathematical definition."""
+        if levels is None:
+            with self.stage('geometry'):
+                levels = cantor_levels(intervals, depth)
+        
+        # Each level sits 10 units below the previous one and thins out with depth,
+        # over at least depth levels so alpha stays within 0-1
+        max_depth = max(max_depth, depth)
+        with self.stage('colour'):
+            styles = [self.cantor_style(depth - level, max_depth) for level in range(len(levels))]
+        
+        with self.stage('artists'):
+            for level, (level_intervals, (linewidth, alpha)) in enumerate(zip(levels, styles)):
+                x, y = self.cantor_line(level_intervals, y_pos - 10 * level)
+                ax.plot(x, y, color=color, linewidth=linewidth, alpha=alpha)
+    
+    def cantor_line(self, intervals: np.ndarray, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """All intervals of a level as the x and y data of one NaN-separated line."""
+        x = np.column_stack([intervals, np.full(len(intervals), np.nan)]).ravel()
+        return x, np.full_like(x, y)
+    
+    def cantor_style(self, remaining: int, max_depth: int = 7) -> Tuple[float, float]:
+        """Line width and alpha of a Cantor level with `remaining` of max_depth levels below it."""
+        # Levels faded so far, rescaled so deeper sets spread the fade of a depth 7 set over all their levels
+        faded = 7 * (max_depth - remaining) / max_depth
+        linewidth = 4 - faded * 0.3
+        linewidth = max(1, linewidth)
+        alpha = 1.0 - faded * 0.1
+        return linewidth, alpha
+    
+    def cantor_set(self, start: Tuple[float, float], length: float, depth: int, ax, color: str, y_pos: float, max_depth: int = 7,
+                   levels: List[np.ndarray] = None):
+        """Wrapper for Cantor set that converts to proper format."""
+        # Start with the interval [0, 1] and scale it
+        initial_intervals = [(start[0], start[0] + length)]
+        self.cantor_set_proper(initial_intervals, depth, ax, color, y_pos, max_depth, levels)
+    
+    def level_styles(self, fractal: str, depth: int, palette: List[str]) -> Dict[int, LevelStyle]:
+        """Fill, stroke and line width of every level, as drawn by the matplotlib methods above."""
+        if fractal == "Sierpinski Triangle":
+            face_colors, edge_colors, linewidths = self.sierpinski_style(depth, depth + 1, palette, max(7, depth))
+            return {level: LevelStyle(tuple(face_colors[level]), tuple(edge_colors[level]), linewidths[level])
+                    for level in range(depth + 1)}
+        elif fractal == "Koch Snowflake":
+            color = to_rgb(self.create_gradient_color(palette, min(depth, 7), 7))
+            linewidth = 2 if depth == 0 else self.koch_linewidth(7)
+            return {depth: LevelStyle(stroke=color + (0.9,), linewidth=linewidth)}
+        elif fractal == "Cantor Set":
+            color = to_rgb(palette[0])
+            styles = {}
+            for level in range(depth + 1):
+                linewidth, alpha = self.cantor_style(depth - level, max(7, depth))
+                styles[level] = LevelStyle(stroke=color + (alpha,), linewidth=linewidth)
+            return styles
+        raise ValueError(f"{fractal} has no vector geometry")
+    
+    def geometry_chunks(self, fractal: str, depth: int, chunk_size: int = CHUNK_SIZE,
+                        view: View = None) -> Iterator[Chunk]:
+        """Stream the geometry of a vector fractal in its default layout, see fractal_stream.
+        
+        With a view, only what is visible is generated, down to the view's level of detail.
+        """
+        if fractal == "Sierpinski Triangle":
+            return sierpinski_chunks(self.SIERPINSKI_POINTS, depth, chunk_size, view)
+        elif fractal == "Koch Snowflake":
+            return koch_chunks(self.koch_layout_triangle(), depth, chunk_size, view)
+        elif fractal == "Cantor Set":
+            return cantor_chunks([self.CANTOR_INTERVAL], depth, self.CANTOR_Y, chunk_size=chunk_size, view=view)
+        raise ValueError(f"{fractal} has no vector geometry")
+    
+    def koch_layout_triangle(self) -> List[Tuple[float, float]]:
+        return self.koch_snowflake_triangle(self.KOCH_CENTER, self.KOCH_SIZE)
+    
+    def draw_layout(self, fractal: str, depth: int, ax, palette: List[str], geometry=None):
+        """Draw a vector fractal in its default layout, from geometry in the format view_geometry returns if given."""
+        if fractal == "Sierpinski Triangle":
+            return self.sierpinski_triangle(list(self.SIERPINSKI_POINTS), depth, ax, palette, max(7, depth),
+                                            levels=geometry)
+        elif fractal == "Koch Snowflake":
+            return self.koch_snowflake(self.KOCH_CENTER, self.KOCH_SIZE, depth, ax, palette, vertices=geometry)
+        elif fractal == "Cantor Set":
+            return self.cantor_set_proper([self.CANTOR_INTERVAL], depth, ax, palette[0], self.CANTOR_Y,
+                                          max(7, depth), levels=geometry)
+        raise ValueError(f"{fractal} has no vector geometry")
+    
+    def layout_lod(self, fractal: str, depth: int, view: View) -> int:
+        """Level geometry_chunks subdivides the default layout down to for view."""
+        if fractal == "Sierpinski Triangle":
+            return view.lod_level(np.ptp(np.asarray(self.SIERPINSKI_POINTS, dtype=float), axis=0).max(), depth, 0.5)
+        elif fractal == "Koch Snowflake":
+            return view.lod_level(self.KOCH_SIZE, depth, 1 / 3)
+        elif fractal == "Cantor Set":
+            return view.lod_level(self.CANTOR_INTERVAL[1] - self.CANTOR_INTERVAL[0], depth, 1 / 3)
+        raise ValueError(f"{fractal} has no vector geometry")
+    
+    def view_geometry(self, fractal: str, depth: int, view: View):
+        """Geometry of the default layout culled to a view, in the format the drawing methods take.
+        
+        Sierpinski and Cantor levels only keep visible items. The Koch outline becomes
+        NaN-separated runs of visible segments.
+        """
+        levels = [[] for _ in range(depth + 1)]
+        for level, chunk in self.geometry_chunks(fractal, depth, view=view):
+            levels[level].append(chunk)
+        
+        if fractal == "Sierpinski Triangle":
+            return [np.concatenate(chunks) if chunks else np.empty((0, 3, 2)) for chunks in levels]
+        elif fractal == "Koch Snowflake":
+            if depth == 0:
+                # The bare triangle is drawn as a patch, leave it whole
+                return np.asarray(self.koch_layout_triangle(), dtype=float)
+            if not levels[depth]:
+                # Nothing of the outline is in view
+                return np.empty((0, 2))
+            segments = np.concatenate(levels[depth])
+            # Break the line wherever culling removed the segments in between
+            breaks = np.flatnonzero(np.any(segments[1:, 0] != segments[:-1, 1], axis=1)) + 1
+            runs = [np.concatenate([run[:, 0], run[-1:, 1], [[np.nan, np.nan]]])
+                    for run in np.split(segments, breaks)]
+            return np.concatenate(runs)[:-1]
+        elif fractal == "Cantor Set":
+            return [np.concatenate(chunks)[:, :, 0] if chunks else np.empty((0, 2)) for chunks in levels]
+        raise ValueError(f"{fractal} has no vector geometry")
+    
+    def levels_as_chunks(self, fractal: str, depth: int, geometry) -> Iterator[Chunk]:
+        """The chunk stream of geometry already built for the default layout, one chunk per level."""
+        if fractal == "Sierpinski Triangle":
+            yield from enumerate(geometry)
+        elif fractal == "Koch Snowflake":
+            segments = np.stack([geometry[:-1], geometry[1:]], axis=1)
+            # Culled outlines are NaN separated, see view_geometry
+            yield depth, segments[np.isfinite(segments).all(axis=(1, 2))]
+        elif fractal == "Cantor Set":
+            for level, intervals in enumerate(geometry):
+                segments = np.empty((len(intervals), 2, 2))
+                segments[:, :, 0] = intervals
+                segments[:, :, 1] = self.CANTOR_Y - 10 * level
+                yield level, segments
+    
+    def rasterize_fractal(self, raster: Rasterizer, fractal: str, depth: int, palette: List[str], geometry=None,
+                          lod: float = 0.0):
+        """Draw a vector fractal straight into a Rasterizer with the same styling as the matplotlib path.
+        
+        geometry is what the default layouts produce: Sierpinski levels, the Koch snowflake
+        vertices, or Cantor levels starting at y = CANTOR_Y. Without it the geometry is streamed
+        in chunks and never held in memory as a whole, only for the raster's band, and
+        subdivision stops at primitives smaller than lod pixels (0 for full depth).
+        """
+        styles = self.level_styles(fractal, depth, palette)
+        if geometry is None:
+            # Keep everything whose stroke can reach into the band
+            margin = max(style.linewidth for style in styles.values()) * raster.pixels_per_point / 2 + 2
+            view = View(raster.band_viewport(), raster.pixel_size, lod, margin)
+            chunks = self.geometry_chunks(fractal, depth, view=view)
+        else:
+            chunks = self.levels_as_chunks(fractal, depth, geometry)
+        rasterize_chunks(raster, chunks, styles)
+    
+    def create_gradient_color(self, palette: List[str], depth: int, max_depth: int) -> str:
+        """Create gradient color based on depth."""
+        if max_depth == 0:
+            return palette[0]
+        
+        # HSV interpolation through the palette's compiled lookup table
+        return get_palette(palette).hex(depth / max_depth)
+    
+    MANDELBROT_BOUNDS = VIEWPORTS["Mandelbrot Set"]
+    
+    def mandelbrot_iterations(self, max_iter: int, width: int = 400, height: int = 400, smooth: bool = False,
+                              workers: int = 1, tile_rows: int = 64, bounds: Tuple[float, float, float, float] = None,
+                              origin: Tuple[Decimal, Decimal] = None):
+        """Compute the Mandelbrot iteration counts over bounds (x_min, x_max, y_min, y_max).
+        
+        With workers > 1 the grid is split into blocks of tile_rows rows rendered in a process pool.
+        Passing a high-precision origin switches to the perturbation deep-zoom kernel, with
+        bounds given as offsets from that origin.
+        """
+        bounds = bounds or self.MANDELBROT_BOUNDS
+        
+        # Escape-time kernel only iterates the points that are still bounded
+        if origin is not None:
+            x_min, x_max, y_min, y_max = bounds
+            half_width, half_height = (x_max - x_min) / 2, (y_max - y_min) / 2
+            center = offset_point(origin, x_min + half_width, y_min + half_height, min(half_width, half_height))
+            iterations, magnitude = escape_time_perturbation(center, half_width, half_height, width, height, max_iter)
+        elif workers > 1:
+            iterations, magnitude = escape_time_tiled(bounds, width, height, max_iter, workers, tile_rows)
+        else:
+            iterations, magnitude = escape_time(complex_grid(bounds, width, height), max_iter)
+        if smooth:
+            iterations = smooth_iterations(iterations, magnitude, max_iter)
+        return iterations
+    
+    def mandelbrot_set(self, ax, max_iter: int, width: int = 400, height: int = 400, smooth: bool = False,
+                       workers: int = 1, tile_rows: int = 64, bounds: Tuple[float, float, float, float] = None,
+                       origin: Tuple[Decimal, Decimal] = None, iterations: np.ndarray = None,
+                       colors: List[str] = None):
+        """Generate Mandelbrot set fractal with enhanced visualization.
+        
+        Pass iterations from mandelbrot_iterations to draw counts that were computed elsewhere,
+        and colors (e.g. a color scheme) to replace the default Mandelbrot colours.
+        """
+        # Define the region of interest
+        x_min, x_max, y_min, y_max = bounds or self.MANDELBROT_BOUNDS
+        if iterations is None:
+            with self.stage('geometry'):
+                iterations = self.mandelbrot_iterations(max_iter, width, height, smooth, workers, tile_rows,
+                                                        (x_min, x_max, y_min, y_max), origin)
+        
+        # Custom colormap, compiled once per colour list
+        with self.stage('colour'):
+            cmap = mandelbrot_palette(colors).colormap
+        
+        with self.stage('artists'):
+            # Plot the result with enhanced colormap
+            im = ax.imshow(iterations, extent=[x_min, x_max, y_min, y_max], 
+                          cmap=cmap, origin='lower', aspect='equal')
+            
+            # Add colorbar
+            cbar = ax.figure.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+            cbar.set_label('Iterations', rotation=270, labelpad=15)
+            
+            # Add grid for better visualization
+            ax.grid(True, alpha=0.3)
+            self.label_mandelbrot_axes(ax, origin)
+            ax.set_title('Mandelbrot Set', fontsize=14, pad=20)
+        return im
+    
+    def label_mandelbrot_axes(self, ax, origin: Tuple[Decimal, Decimal] = None):
+        """Label the complex-plane axes, as offsets from origin in deep zoom mode."""
+        if origin is None:
+            ax.set_xlabel('Real', fontsize=12)
+            ax.set_ylabel('Imaginary', fontsize=12)
+        else:
+            ax.set_xlabel(f'Real - {origin[0]:.20e}', fontsize=12)
+            ax.set_ylabel(f'Imaginary - {origin[1]:.20e}', fontsize=12)
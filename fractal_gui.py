@@ -1,264 +1,117 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import queue
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import numpy as np
 import math
-from typing import List, Tuple
-import matplotlib.cm as cm
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib.patches import Polygon
-import colorsys
+from contextlib import nullcontext
 
-class FractalGenerator:
-    def __init__(self):
-        self.canvas = None
-        self.figure = None
-        
-    def midpoint(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> Tuple[float, float]:
-        """Calculate midpoint between two points."""
-        return ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
-    
-    def draw_triangle(self, points: List[Tuple[float, float]], color: str, ax, depth: int, max_depth: int):
-        """Draw a filled triangle with gradient shading."""
-        # Create gradient effect based on depth
-        alpha = 0.9 - (depth / max_depth) * 0.3
-        
-        # Fix polygon color warning by using facecolor instead of color
-        triangle = Polygon(points, facecolor=color, alpha=alpha, edgecolor='black', linewidth=0.5)
-        ax.add_patch(triangle)
-    
-    def sierpinski_triangle(self, points: List[Tuple[float, float]], depth: int, ax, palette: List[str], max_depth: int = 7):
-        """Generate Sierpinski triangle fractal with gradient colors."""
-        # Create gradient color based on depth
-        color = self.create_gradient_color(palette, depth, max_depth)
-        self.draw_triangle(points, color, ax, depth, max_depth)
-        
-        if depth > 0:
-            p0, p1, p2 = points
-            self.sierpinski_triangle([p0, self.midpoint(p0, p1), self.midpoint(p0, p2)], depth - 1, ax, palette, max_depth)
-            self.sierpinski_triangle([p1, self.midpoint(p1, p0), self.midpoint(p1, p2)], depth - 1, ax, palette, max_depth)
-            self.sierpinski_triangle([p2, self.midpoint(p2, p0), self.midpoint(p2, p1)], depth - 1, ax, palette, max_depth)
-    
-    def koch_curve(self, start: Tuple[float, float], end: Tuple[float, float], depth: int, ax, color: str, max_depth: int = 7):
-        """Generate Koch curve fractal with gradient line width."""
-        if depth == 0:
-            # Gradient line width based on depth
-            linewidth = 3 - (max_depth - depth) * 0.2
-            linewidth = max(0.5, linewidth)
-            ax.plot([start[0], end[0]], [start[1], end[1]], color=color, linewidth=linewidth, alpha=0.9)
-        else:
-            # Calculate the four points of the Koch curve
-            p1 = start
-            p2 = ((2*start[0] + end[0])/3, (2*start[1] + end[1])/3)
-            
-            # Calculate the peak point - corrected angle calculation
-            dx = end[0] - start[0]
-            dy = end[1] - start[1]
-            length = math.sqrt(dx*dx + dy*dy) / 3
-            angle = math.atan2(dy, dx)
-            
-            # The peak should be at 60 degrees from the line
-            p3 = (p2[0] + length * math.cos(angle + math.pi/3), 
-                  p2[1] + length * math.sin(angle + math.pi/3))
-            
-            p4 = ((start[0] + 2*end[0])/3, (start[1] + 2*end[1])/3)
-            p5 = end
-            
-            # Recursively draw the four segments
-            self.koch_curve(p1, p2, depth - 1, ax, color, max_depth)
-            self.koch_curve(p2, p3, depth - 1, ax, color, max_depth)
-            self.koch_curve(p3, p4, depth - 1, ax, color, max_depth)
-            self.koch_curve(p4, p5, depth - 1, ax, color, max_depth)
-    
-    def koch_snowflake(self, center: Tuple[float, float], size: float, depth: int, ax, palette: List[str]):
-        """Generate Koch snowflake fractal with gradient colors."""
-        # Alternative approach: Start with equilateral triangle
-        # Calculate the three vertices of the initial triangle
-        height = size * math.sqrt(3) / 2
-        
-        # Vertices of equilateral triangle
-        v1 = (center[0], center[1] + 2*height/3)
-        v2 = (center[0] - size/2, center[1] - height/3)
-        v3 = (center[0] + size/2, center[1] - height/3)
-        
-        color = self.create_gradient_color(palette, depth, 7)
-        
-        # Draw the three sides of the triangle using Koch curves
-        # Try alternative approach for better snowflake formation
-        if depth == 0:
-            # Base case: draw simple triangle
-            triangle = plt.Polygon([v1, v2, v3], fill=False, edgecolor=color, linewidth=2, alpha=0.9)
-            ax.add_patch(triangle)
-        else:
-            # Recursive case: apply Koch curve transformation to each side
-            # Use the proper Koch curve implementation
-            self.koch_curve_proper(v1, v2, depth, ax, color, 7)
-            self.koch_curve_proper(v2, v3, depth, ax, color, 7)
-            self.koch_curve_proper(v3, v1, depth, ax, color, 7)
-    
-    def koch_curve_proper(self, start: Tuple[float, float], end: Tuple[float, float], depth: int, ax, color: str, max_depth: int = 7):
-        """Proper Koch curve implementation following the mathematical definition."""
-        if depth == 0:
-            # Base case: draw a straight line
-            linewidth = 3 - (max_depth - depth) * 0.2
-            linewidth = max(0.5, linewidth)
-            ax.plot([start[0], end[0]], [start[1], end[1]], color=color, linewidth=linewidth, alpha=0.9)
-        else:
-            # Divide the line segment into three equal parts
-            p1 = start
-            p2 = ((2*start[0] + end[0])/3, (2*start[1] + end[1])/3)
-            p4 = ((start[0] + 2*end[0])/3, (start[1] + 2*end[1])/3)
-            p5 = end
-            
-            # Calculate the outward bend (equilateral triangle peak)
-            # Vector from p2 to p4
-            dx = p4[0] - p2[0]
-            dy = p4[1] - p2[1]
-            segment_length = math.sqrt(dx*dx + dy*dy)
-            
-            if segment_length > 0:
-                # Unit vector along the line segment
-                ux = dx / segment_length
-                uy = dy / segment_length
-                
-                # Perpendicular vector (rotated 90 degrees counterclockwise)
-                px = -uy
-                py = ux
-                
-                # The peak forms an equilateral triangle, so the height is segment_length * sqrt(3)/2
-                height = segment_length * math.sqrt(3) / 2
-                
-                # The peak point is at the midpoint of p2-p4 plus the height in perpendicular direction
-                p3 = (p2[0] + (p4[0] - p2[0])/2 + px * height,
-                      p2[1] + (p4[1] - p2[1])/2 + py * height)
+from fractal_bench import StageTimer
+from fractal_cache import GeometryCache
+from fractal_engine import offset_point
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES
+from fractal_raster import rasterize, rasterize_to_png
+from fractal_scene import FractalScene
+from fractal_stream import View
+
+class RenderScheduler:
+    """Run fractal generation on a worker thread and apply only the newest result on the Tk thread.
+    
+    With supersede=False every job runs and every result is applied, in submission order,
+    for work such as exports that must not be dropped by later renders.
+    """
+    
+    def __init__(self, root, poll_interval_ms: int = 30, supersede: bool = True,
+                 error_message: str = "Error generating fractal"):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.supersede = supersede
+        self.error_message = error_message
+        self.generation = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.results = queue.Queue()
+        self.root.after(self.poll_interval_ms, self.poll)
+    
+    def submit(self, compute, apply, *args) -> int:
+        """Run compute(*args) on the worker and apply(result, seconds) on the Tk thread.
+        
+        Submitting supersedes every earlier job: jobs that have not started are skipped and
+        results that arrive late are dropped. If compute returns a generator, each value it
+        yields is applied in turn, so multi-pass jobs stop at the next pass once superseded.
+        """
+        self.generation += 1
+        self.executor.submit(self.run, self.generation, compute, apply, args)
+        return self.generation
+    
+    def cancel(self):
+        """Drop whatever is queued or running."""
+        self.generation += 1
+    
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation or not self.supersede
+    
+    def run(self, generation, compute, apply, args):
+        """Worker thread: compute a job unless it was superseded while waiting."""
+        if not self.is_current(generation):
+            return
+        start = time.perf_counter()
+        try:
+            result = compute(*args)
+            if isinstance(result, types.GeneratorType):
+                for value in result:
+                    self.results.put((generation, apply, value, time.perf_counter() - start))
+                    if not self.is_current(generation):
+                        result.close()
+                        return
             else:
-                p3 = p2
-            
-            # Recursively draw the four segments
-            self.koch_curve_proper(p1, p2, depth - 1, ax, color, max_depth)
-            self.koch_curve_proper(p2, p3, depth - 1, ax, color, max_depth)
-            self.koch_curve_proper(p3, p4, depth - 1, ax, color, max_depth)
-            self.koch_curve_proper(p4, p5, depth - 1, ax, color, max_depth)
-    
-    def cantor_set_proper(self, intervals: List[Tuple[float, float]], depth: int, ax, color: str, y_pos: float, max_depth: int = 7):
-        """Proper Cantor set implementation following the mathematical definition."""
-        if depth == 0:
-            # Base case: draw all remaining intervals
-            linewidth = 4 - (max_depth - depth) * 0.3
-            linewidth = max(1, linewidth)
-            alpha = 1.0 - (max_depth - depth) * 0.1
-            
-            for start, end in intervals:
-                ax.plot([start, end], [y_pos, y_pos], color=color, linewidth=linewidth, alpha=alpha)
-        else:
-            # Apply Cantor set construction: delete middle third from each interval
-            new_intervals = []
-            
-            for start, end in intervals:
-                length = end - start
-                # Create two new intervals: [start, start + length/3] and [start + 2*length/3, end]
-                new_intervals.append((start, start + length/3))
-                new_intervals.append((start + 2*length/3, end))
-            
-            # Recursively apply to the new intervals
-            self.cantor_set_proper(new_intervals, depth - 1, ax, color, y_pos - 10, max_depth)
-            
-            # Also draw the current level
-            linewidth = 4 - (max_depth - depth) * 0.3
-            linewidth = max(1, linewidth)
-            alpha = 1.0 - (max_depth - depth) * 0.1
-            
-            for start, end in intervals:
-                ax.plot([start, end], [y_pos, y_pos], color=color, linewidth=linewidth, alpha=alpha)
-    
-    def cantor_set(self, start: Tuple[float, float], length: float, depth: int, ax, color: str, y_pos: float, max_depth: int = 7):
-        """Wrapper for Cantor set that converts to proper format."""
-        # Start with the interval [0, 1] and scale it
-        initial_intervals = [(start[0], start[0] + length)]
-        self.cantor_set_proper(initial_intervals, depth, ax, color, y_pos, max_depth)
-    
-    def create_gradient_color(self, palette: List[str], depth: int, max_depth: int) -> str:
-        """Create gradient color based on depth."""
-        if max_depth == 0:
-            return palette[0]
-        
-        # Normalize depth to 0-1 range
-        normalized_depth = depth / max_depth
-        
-        # Convert palette colors to HSV for smooth interpolation
-        colors_hsv = []
-        for color in palette:
-            # Convert hex to RGB to HSV
-            hex_color = color.lstrip('#')
-            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            hsv = colorsys.rgb_to_hsv(rgb[0]/255.0, rgb[1]/255.0, rgb[2]/255.0)
-            colors_hsv.append(hsv)
-        
-        # Interpolate between colors based on depth
-        color_index = normalized_depth * (len(colors_hsv) - 1)
-        lower_idx = int(color_index)
-        upper_idx = min(lower_idx + 1, len(colors_hsv) - 1)
-        
-        if lower_idx == upper_idx:
-            selected_hsv = colors_hsv[lower_idx]
-        else:
-            t = color_index - lower_idx
-            selected_hsv = (
-                colors_hsv[lower_idx][0] + t * (colors_hsv[upper_idx][0] - colors_hsv[lower_idx][0]),
-                colors_hsv[lower_idx][1] + t * (colors_hsv[upper_idx][1] - colors_hsv[lower_idx][1]),
-                colors_hsv[lower_idx][2] + t * (colors_hsv[upper_idx][2] - colors_hsv[lower_idx][2])
-            )
-        
-        # Convert back to hex
-        rgb = colorsys.hsv_to_rgb(selected_hsv[0], selected_hsv[1], selected_hsv[2])
-        hex_color = '#' + ''.join(f'{int(c*255):02x}' for c in rgb)
-        return hex_color
-    
-    def mandelbrot_set(self, ax, max_iter: int):
-        """Generate Mandelbrot set fractal with enhanced visualization."""
-        # Define the region of interest
-        x_min, x_max = -2.5, 1.5
-        y_min, y_max = -2, 2
-        
-        # Create a grid of complex numbers
-        width, height = 400, 400
-        x = np.linspace(x_min, x_max, width)
-        y = np.linspace(y_min, y_max, height)
-        X, Y = np.meshgrid(x, y)
-        C = X + 1j * Y
-        
-        # Initialize the result array
-        Z = np.zeros_like(C)
-        iterations = np.zeros(C.shape, dtype=int)
-        
-        # Calculate the Mandelbrot set
-        for i in range(max_iter):
-            mask = np.abs(Z) <= 2
-            Z[mask] = Z[mask]**2 + C[mask]
-            iterations += mask
-        
-        # Create custom colormap with better colors
-        colors = ['#000428', '#004e92', '#009ffd', '#2a2a72', '#ff6b6b', '#feca57', '#48dbfb', '#ff9ff3']
-        n_bins = 256
-        cmap = LinearSegmentedColormap.from_list('mandelbrot', colors, N=n_bins)
-        
-        # Plot the result with enhanced colormap
-        im = ax.imshow(iterations, extent=[x_min, x_max, y_min, y_max], 
-                      cmap=cmap, origin='lower', aspect='equal')
-        
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
-        cbar.set_label('Iterations', rotation=270, labelpad=15)
-        
-        # Add grid for better visualization
-        ax.grid(True, alpha=0.3)
-        ax.set_xlabel('Real', fontsize=12)
-        ax.set_ylabel('Imaginary', fontsize=12)
-        ax.set_title('Mandelbrot Set', fontsize=14, pad=20)
+                self.results.put((generation, apply, result, time.perf_counter() - start))
+        except Exception as e:
+            self.results.put((generation, None, e, time.perf_counter() - start))
+    
+    def poll(self):
+        """Tk thread: apply finished results of the newest job."""
+        try:
+            while True:
+                generation, apply, result, seconds = self.results.get_nowait()
+                if not self.is_current(generation):
+                    continue
+                if apply is None:
+                    messagebox.showerror("Error", f"{self.error_message}: {str(result)}")
+                    continue
+                try:
+                    apply(result, seconds)
+                except Exception as e:
+                    messagebox.showerror("Error", f"{self.error_message}: {str(e)}")
+        except queue.Empty:
+            pass
+        self.root.after(self.poll_interval_ms, self.poll)
 
 class FractalGUI:
+    # Deepest level the slider allows for each fractal type
+    MAX_DEPTHS = {
+        "Sierpinski Triangle": 12,
+        "Koch Snowflake": 10,
+        "Cantor Set": 7,
+        "Mandelbrot Set": 7,
+    }
+    
+    # Full Mandelbrot resolution and the downscale factor of each refinement pass
+    MANDELBROT_RESOLUTION = 400
+    REFINE_STEPS = (8, 4, 2, 1)
+    ZOOM_FACTOR = 0.8
+    POLL_INTERVAL_MS = 30
+    
+    # Raster renderer: on-screen image width and the width of saved images (8k UHD)
+    RASTER_WIDTH = 800
+    EXPORT_WIDTH = 7680
+    # Level of detail: vector primitives smaller than this many pixels are not subdivided
+    LOD_THRESHOLD = 1.0
+
     def __init__(self, root):
         self.root = root
         self.root.title("Fractal Generator")
@@ -272,6 +125,29 @@ class FractalGUI:
         self.depth = 3
         self.color_scheme = "Vibrant"
         
+        # Mandelbrot viewport and progressive refinement state
+        self.view_bounds = FractalGenerator.MANDELBROT_BOUNDS
+        self.view_origin = None
+        self.mandelbrot_ax = None
+        self.mandelbrot_image = None
+        self.pan_start = None
+        self.pan_bounds = None
+        
+        # Zoomed region of each vector fractal, drawn on vector_ax
+        self.vector_views = {fractal: viewport for fractal, viewport in FractalGenerator.VIEWPORTS.items()
+                             if fractal != "Mandelbrot Set"}
+        self.vector_ax = None
+        
+        # Generation runs on a worker thread so the Tk mainloop never blocks
+        self.scheduler = RenderScheduler(self.root, self.POLL_INTERVAL_MS)
+        # Exports take seconds at 8k, so they get their own worker and are never superseded by renders
+        self.exporter = RenderScheduler(self.root, self.POLL_INTERVAL_MS, supersede=False,
+                                        error_message="Error saving image")
+        # Geometry is palette independent, so recolouring and revisiting a depth hit the cache
+        self.geometry_cache = GeometryCache()
+        # Per-stage timings of the current render, when "Stage timings" is checked
+        self.stage_timer = None
+        
         self.setup_ui()
         self.update_fractal()
     
@@ -293,13 +169,13 @@ class FractalGUI:
         fractal_combo.pack(fill=tk.X, pady=(0, 10))
         fractal_combo.bind('<<ComboboxSelected>>', self.on_fractal_change)
         
-        # Depth slider (limited to 7)
+        # Depth slider (limit depends on the fractal type)
         self.depth_label = ttk.Label(control_frame, text=f"Depth: {self.depth}")
         self.depth_label.pack(anchor=tk.W)
         self.depth_var = tk.IntVar(value=self.depth)
-        depth_scale = ttk.Scale(control_frame, from_=0, to=7, variable=self.depth_var, 
-                              orient=tk.HORIZONTAL, command=self.on_depth_change)
-        depth_scale.pack(fill=tk.X, pady=(0, 10))
+        self.depth_scale = ttk.Scale(control_frame, from_=0, to=self.MAX_DEPTHS[self.current_fractal],
+                                     variable=self.depth_var, orient=tk.HORIZONTAL, command=self.on_depth_change)
+        self.depth_scale.pack(fill=tk.X, pady=(0, 10))
         
         # Add update delay to prevent too frequent updates during slider movement
         self.update_job = None
@@ -308,18 +184,52 @@ class FractalGUI:
         ttk.Label(control_frame, text="Color Scheme:").pack(anchor=tk.W)
         self.color_var = tk.StringVar(value=self.color_scheme)
         color_combo = ttk.Combobox(control_frame, textvariable=self.color_var,
-                                 values=["Vibrant", "Ocean", "Sunset", "Forest", "Fire", "Pastel"],
+                                 values=list(COLOR_SCHEMES),
                                  state="readonly")
         color_combo.pack(fill=tk.X, pady=(0, 10))
         color_combo.bind('<<ComboboxSelected>>', self.on_color_change)
         
+        # Draw vector fractals straight into an image instead of matplotlib artists
+        self.raster_var = tk.BooleanVar(value=False)
+        raster_check = ttk.Checkbutton(control_frame, text="Raster renderer", variable=self.raster_var,
+                                       command=self.update_fractal)
+        raster_check.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Stop subdividing below a pixel and skip what is off screen
+        self.lod_var = tk.BooleanVar(value=True)
+        lod_check = ttk.Checkbutton(control_frame, text="Level of detail", variable=self.lod_var,
+                                    command=self.update_fractal)
+        lod_check.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Break render times down into geometry, colour, artists and render stages
+        self.timing_var = tk.BooleanVar(value=False)
+        timing_check = ttk.Checkbutton(control_frame, text="Stage timings", variable=self.timing_var,
+                                       command=self.update_fractal)
+        timing_check.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Keep one axes per fractal and update its data in place instead of rebuilding the figure
+        self.scene_var = tk.BooleanVar(value=True)
+        scene_check = ttk.Checkbutton(control_frame, text="Persistent scene", variable=self.scene_var,
+                                      command=self.on_scene_toggle)
+        scene_check.pack(anchor=tk.W, pady=(0, 10))
+        
         # Update button (now optional since slider auto-updates)
         update_btn = ttk.Button(control_frame, text="Refresh Fractal", command=self.update_fractal)
         update_btn.pack(fill=tk.X, pady=(0, 10))
         
+        # Reset the Mandelbrot zoom/pan
+        reset_btn = ttk.Button(control_frame, text="Reset View", command=self.reset_view)
+        reset_btn.pack(fill=tk.X, pady=(0, 10))
+        
         # Save button
         save_btn = ttk.Button(control_frame, text="Save Image", command=self.save_image)
-        save_btn.pack(fill=tk.X)
+        save_btn.pack(fill=tk.X, pady=(0, 10))
+        
+        # Render progress and timing
+        self.progress = ttk.Progressbar(control_frame, mode='determinate', maximum=1.0)
+        self.progress.pack(fill=tk.X, pady=(0, 5))
+        self.status_label = ttk.Label(control_frame, text="", wraplength=180, justify=tk.LEFT)
+        self.status_label.pack(anchor=tk.W)
         
         # Plot frame
         plot_frame = ttk.Frame(main_frame)
@@ -329,6 +239,13 @@ class FractalGUI:
         self.figure = Figure(figsize=(8, 6), dpi=100, facecolor='#f0f0f0')
         self.canvas = FigureCanvasTkAgg(self.figure, plot_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.scene = FractalScene(self.figure, self.fractal_generator)
+        
+        # Mouse-wheel zoom and drag-to-pan on the Mandelbrot view
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
     
     def setup_theme(self):
         """Setup the grey theme for the application."""
@@ -346,18 +263,19 @@ class FractalGUI:
     
     def get_color_palette(self):
         """Get color palette based on selected scheme."""
-        schemes = {
-            "Vibrant": ["#e74c3c", "#f39c12", "#f1c40f", "#2ecc71", "#3498db", "#9b59b6", "#e91e63"],
-            "Ocean": ["#1abc9c", "#16a085", "#3498db", "#2980b9", "#34495e", "#2c3e50", "#95a5a6"],
-            "Sunset": ["#ff7675", "#fd79a8", "#fdcb6e", "#e17055", "#d63031", "#74b9ff", "#0984e3"],
-            "Forest": ["#00b894", "#00cec9", "#55a3ff", "#74b9ff", "#a29bfe", "#6c5ce7", "#fd79a8"],
-            "Fire": ["#ff6b6b", "#ffa726", "#ffca28", "#66bb6a", "#42a5f5", "#ab47bc", "#ef5350"],
-            "Pastel": ["#ff9ff3", "#54a0ff", "#5f27cd", "#00d2d3", "#ff9f43", "#10ac84", "#ee5a24"]
-        }
-        return schemes.get(self.color_scheme, schemes["Vibrant"])
+        return COLOR_SCHEMES.get(self.color_scheme, COLOR_SCHEMES["Vibrant"])
     
     def on_fractal_change(self, event):
         self.current_fractal = self.fractal_var.get()
+        
+        # Clamp the depth to what the new fractal supports
+        max_depth = self.MAX_DEPTHS[self.current_fractal]
+        self.depth_scale.config(to=max_depth)
+        if self.depth > max_depth:
+            self.depth = max_depth
+            self.depth_var.set(max_depth)
+            self.depth_label.config(text=f"Depth: {self.depth}")
+        
         self.update_fractal()
     
     def on_depth_change(self, value):
@@ -376,71 +294,365 @@ class FractalGUI:
         self.color_scheme = self.color_var.get()
         self.update_fractal()
     
+    def on_scene_toggle(self):
+        # Either way the figure is rebuilt from scratch once
+        self.scene.reset()
+        self.update_fractal()
+    
     def update_fractal(self):
-        """Update the fractal display."""
+        """Generate the current fractal on the render worker and draw it when it is ready."""
+        # Ignore zoom/pan on the old axes until the new figure is built
+        self.mandelbrot_ax = None
+        self.mandelbrot_image = None
+        self.vector_ax = None
+        self.render()
+    
+    def render(self):
+        """Submit the current fractal and view to the render worker."""
+        self.stage_timer = StageTimer() if self.timing_var.get() else None
+        self.set_status(f"Rendering {self.current_fractal} (depth {self.depth})...", 0.0)
+        raster_palette = self.get_color_palette() if self.raster_var.get() else None
+        bounds = self.current_bounds()
+        self.scheduler.submit(self.compute_fractal, self.draw_fractal, self.current_fractal, self.depth,
+                              bounds, self.view_origin, self.mandelbrot_max_iter(), raster_palette,
+                              self.render_view(self.current_fractal, bounds), self.stage_timer)
+    
+    def render_view(self, fractal, bounds):
+        """View for view-aware vector generation, or None to draw the full cached geometry."""
+        if fractal == "Mandelbrot Set":
+            return None
+        threshold = self.LOD_THRESHOLD if self.lod_var.get() else 0.0
+        if threshold == 0.0 and bounds == FractalGenerator.VIEWPORTS[fractal]:
+            return None
+        if self.vector_ax is not None and not self.raster_var.get():
+            # Screen pixels of the axes being zoomed
+            return View.from_axes(self.vector_ax, threshold)
+        return View.for_image(bounds, self.RASTER_WIDTH, threshold)
+    
+    def compute_fractal(self, fractal, depth, bounds, origin, max_iter, raster_palette=None, view=None, timer=None):
+        """Worker thread: generate the geometry for one render as plain arrays.
+        
+        With a raster_palette, vector fractals are also rasterized here and the image is
+        returned alongside the geometry, otherwise the image is None. With a view, vector
+        geometry is culled to it and only subdivided down to its level of detail. With a
+        StageTimer, generation and rasterization are timed as its geometry and raster stages.
+        """
+        if fractal == "Mandelbrot Set":
+            # Coarse preview first, refine_mandelbrot sharpens it afterwards
+            size = self.MANDELBROT_RESOLUTION // self.REFINE_STEPS[0]
+            with self.timed(timer, 'geometry'):
+                iterations = self.cached_mandelbrot(bounds, origin, max_iter, size)
+            return fractal, depth, (bounds, origin, max_iter, iterations), None
+        
+        with self.timed(timer, 'geometry'):
+            geometry = self.vector_geometry(fractal, depth, view)
+        image = None
+        if raster_palette is not None:
+            with self.timed(timer, 'raster'):
+                image = self.rasterize_geometry(fractal, depth, geometry, raster_palette, viewport=bounds)
+        return fractal, depth, geometry, image
+    
+    def timed(self, timer, stage):
+        """Context manager timing a block as a stage of timer, or doing nothing without one."""
+        return timer.stage(stage) if timer is not None else nullcontext()
+    
+    def vector_geometry(self, fractal, depth, view=None):
+        """Cached geometry of a vector fractal in its default layout, culled to view if given.
+        
+        A view covering the default viewport sees the whole layout, so there only its level
+        of detail matters and the levels come from the incremental cache, capped at that level.
+        """
+        if view is not None and not self.covers_layout(fractal, view):
+            return self.geometry_cache.get_or_compute(
+                (fractal, depth, view), lambda: self.fractal_generator.view_geometry(fractal, depth, view))
+        lod = depth if view is None else self.fractal_generator.layout_lod(fractal, depth, view)
+        if fractal == "Sierpinski Triangle":
+            points = FractalGenerator.SIERPINSKI_POINTS
+            return [self.geometry_cache.sierpinski_level(points, min(level, lod)) for level in range(depth + 1)]
+        elif fractal == "Koch Snowflake":
+            return self.geometry_cache.koch_polyline(self.fractal_generator.koch_layout_triangle(), lod)
+        elif fractal == "Cantor Set":
+            intervals = [FractalGenerator.CANTOR_INTERVAL]
+            return [self.geometry_cache.cantor_level(intervals, min(level, lod)) for level in range(depth + 1)]
+    
+    def covers_layout(self, fractal, view):
+        """Whether view shows all of the default viewport, so culling would keep everything."""
+        x_min, x_max, y_min, y_max = view.viewport
+        d_x_min, d_x_max, d_y_min, d_y_max = FractalGenerator.VIEWPORTS[fractal]
+        return x_min <= d_x_min and x_max >= d_x_max and y_min <= d_y_min and y_max >= d_y_max
+    
+    def rasterize_geometry(self, fractal, depth, geometry, palette, width=None, filename=None, viewport=None,
+                           lod=0.0):
+        """Rasterize vector geometry over viewport, into an RGBA array or streamed to a PNG file.
+        
+        Pass geometry=None to stream it, culled to each band and subdivided down to lod pixels.
+        """
+        width = width or self.RASTER_WIDTH
+        viewport = viewport or FractalGenerator.VIEWPORTS[fractal]
+        x_min, x_max, y_min, y_max = viewport
+        height = round(width * (y_max - y_min) / (x_max - x_min))
+        # Scale line widths with the image so exports look like the on-screen render
+        dpi = 100 * width / self.RASTER_WIDTH
+        
+        def draw(raster):
+            self.fractal_generator.rasterize_fractal(raster, fractal, depth, palette, geometry, lod)
+        
+        if filename:
+            rasterize_to_png(filename, draw, width, height, viewport, dpi)
+            return filename
+        return rasterize(draw, width, height, viewport, dpi)
+    
+    def cached_mandelbrot(self, bounds, origin, max_iter, size):
+        """Square iteration buffer for a view, from the geometry cache when available."""
+        return self.geometry_cache.mandelbrot_iterations(
+            (bounds, origin, max_iter, size, size),
+            lambda: self.fractal_generator.mandelbrot_iterations(max_iter, size, size, bounds=bounds, origin=origin))
+    
+    def draw_fractal(self, result, seconds):
+        """Tk thread: show geometry produced by compute_fractal, in the persistent scene or a rebuilt figure."""
+        fractal, depth, geometry, image = result
+        draw_start = time.perf_counter()
+        # The generator splits its drawing methods into colour and artist stages
+        self.fractal_generator.timer = self.stage_timer
+        if self.scene_var.get():
+            blitted = self.draw_scene(fractal, depth, geometry, image)
+        else:
+            self.rebuild_figure(fractal, depth, geometry, image)
+            blitted = False
+        self.fractal_generator.timer = None
+        draw_seconds = time.perf_counter() - draw_start
+        
+        drawn = f"{'blitted' if blitted else 'drawn'} in {draw_seconds * 1000:.0f} ms"
+        if fractal == "Mandelbrot Set":
+            self.set_status(f"Preview: generated in {seconds * 1000:.0f} ms, {drawn}", 1 / len(self.REFINE_STEPS))
+            self.request_refinement(self.REFINE_STEPS[1:])
+        else:
+            self.set_status(f"Generated in {seconds * 1000:.0f} ms, {drawn}", 1.0)
+    
+    def draw_scene(self, fractal, depth, geometry, image):
+        """Swap a render into the persistent scene, returning True if blitting it was enough."""
+        bounds = geometry[0] if fractal == "Mandelbrot Set" else self.vector_views[fractal]
+        self.scene.show(fractal, depth, geometry, image, self.get_color_palette(), bounds)
+        if fractal == "Mandelbrot Set":
+            self.mandelbrot_image = self.scene.artists[fractal]['iterations']
+            self.mandelbrot_ax = self.scene.axes[fractal]
+        else:
+            self.vector_ax = self.scene.axes[fractal]
+        with self.timed(self.stage_timer, 'render'):
+            return self.scene.draw()
+    
+    def rebuild_figure(self, fractal, depth, geometry, image):
+        """Clear the figure and draw the fractal on new axes."""
         self.figure.clear()
         ax = self.figure.add_subplot(111)
         
         palette = self.get_color_palette()
         
-        try:
-            if self.current_fractal == "Sierpinski Triangle":
-                ax.set_aspect('equal')
-                # Equilateral triangle coordinates
-                size = 200
-                points = [(-size, -size), (0, size), (size, -size)]
-                self.fractal_generator.sierpinski_triangle(points, self.depth, ax, palette, 7)
-                ax.set_xlim(-size*1.2, size*1.2)
-                ax.set_ylim(-size*1.2, size*1.2)
-                ax.grid(True, alpha=0.3)
-                ax.set_xlabel('X', fontsize=12)
-                ax.set_ylabel('Y', fontsize=12)
-                
-            elif self.current_fractal == "Koch Snowflake":
-                ax.set_aspect('equal')
-                self.fractal_generator.koch_snowflake((0, 0), 300, self.depth, ax, palette)
-                ax.set_xlim(-200, 200)
-                ax.set_ylim(-200, 200)
-                ax.grid(True, alpha=0.3)
-                ax.set_xlabel('X', fontsize=12)
-                ax.set_ylabel('Y', fontsize=12)
-                
-            elif self.current_fractal == "Cantor Set":
-                ax.set_aspect('equal')
-                self.fractal_generator.cantor_set((-200, 0), 400, self.depth, ax, palette[0], 100, 7)
-                ax.set_xlim(-250, 250)
-                ax.set_ylim(-200, 150)
-                ax.grid(True, alpha=0.3)
-                ax.set_xlabel('Position', fontsize=12)
-                ax.set_ylabel('Level', fontsize=12)
-                
-            elif self.current_fractal == "Mandelbrot Set":
-                # Enhanced Mandelbrot depth scaling
-                max_iter = max(20, self.depth * 50 + 50)  # Better scaling: 20-400 iterations
-                self.fractal_generator.mandelbrot_set(ax, max_iter)
-                ax.set_aspect('equal')
-            
-            # Set title with proper spacing to avoid covering the image
-            self.figure.suptitle(f"{self.current_fractal} (Depth: {self.depth})", 
-                               fontsize=14, y=0.95, color='#333333')
+        if image is not None:
+            # Raster renderer: the whole fractal is a single image
+            ax.imshow(image, extent=self.vector_views[fractal], interpolation='nearest')
+            ax.set_aspect('equal')
+            self.set_viewport(ax, fractal)
+            ax.grid(True, alpha=0.3)
+            ax.set_xlabel('Position' if fractal == "Cantor Set" else 'X', fontsize=12)
+            ax.set_ylabel('Level' if fractal == "Cantor Set" else 'Y', fontsize=12)
+        
+        elif fractal != "Mandelbrot Set":
+            ax.set_aspect('equal')
+            self.fractal_generator.draw_layout(fractal, depth, ax, palette, geometry)
+            self.set_viewport(ax, fractal)
+            ax.grid(True, alpha=0.3)
+            ax.set_xlabel('Position' if fractal == "Cantor Set" else 'X', fontsize=12)
+            ax.set_ylabel('Level' if fractal == "Cantor Set" else 'Y', fontsize=12)
             
-            # Adjust layout to prevent title overlap
+        else:
+            bounds, origin, max_iter, iterations = geometry
+            self.mandelbrot_image = self.fractal_generator.mandelbrot_set(
+                ax, max_iter, bounds=bounds, origin=origin, iterations=iterations)
+            self.mandelbrot_ax = ax
+            ax.set_aspect('equal')
+        
+        if fractal != "Mandelbrot Set":
+            self.vector_ax = ax
+        
+        # Set title with proper spacing to avoid covering the image
+        self.figure.suptitle(f"{fractal} (Depth: {depth})", 
+                           fontsize=14, y=0.95, color='#333333')
+        
+        # Adjust layout to prevent title overlap
+        with self.timed(self.stage_timer, 'render'):
             self.figure.tight_layout(rect=[0, 0.03, 1, 0.93])
-            
-            # Force canvas update
+            self.canvas.draw()
+    
+    def set_viewport(self, ax, fractal):
+        """Apply the current (possibly zoomed) limits of a vector fractal."""
+        x_min, x_max, y_min, y_max = self.vector_views[fractal]
+        ax.set_xlim(x_min, x_max)
+        ax.set_ylim(y_min, y_max)
+    
+    def set_status(self, text, fraction):
+        """Show render progress (0-1), timing and cache statistics in the control panel."""
+        if self.stage_timer is not None and self.stage_timer.times:
+            text += f"\nStages: {self.stage_timer.summary()}"
+        stats = self.geometry_cache.stats()
+        text += (f"\nCache: {stats['hits']} hits, {stats['misses']} misses, "
+                 f"{stats['bytes'] / 2**20:.1f}/{stats['max_bytes'] / 2**20:.0f} MB")
+        self.status_label.config(text=text)
+        self.progress.config(value=fraction)
+    
+    def mandelbrot_max_iter(self):
+        """Iteration budget for the current depth and zoom level."""
+        max_iter = FractalGenerator.default_max_iter(self.depth)
+        # Deeper zooms need more iterations to resolve the boundary
+        x_min, x_max = self.view_bounds[:2]
+        zoom = math.log10(4 / (x_max - x_min))
+        return max_iter + int(100 * max(0.0, zoom))
+    
+    def reset_view(self):
+        """Return the current fractal to its full view."""
+        if self.current_fractal == "Mandelbrot Set":
+            self.view_bounds = FractalGenerator.MANDELBROT_BOUNDS
+            self.view_origin = None
+        else:
+            self.vector_views[self.current_fractal] = FractalGenerator.VIEWPORTS[self.current_fractal]
+        self.update_fractal()
+    
+    def zoom_axes(self):
+        """The axes that zoom and pan act on, None while it is being rebuilt."""
+        return self.mandelbrot_ax if self.current_fractal == "Mandelbrot Set" else self.vector_ax
+    
+    def current_bounds(self):
+        return self.view_bounds if self.current_fractal == "Mandelbrot Set" else self.vector_views[self.current_fractal]
+    
+    def set_view(self, bounds):
+        """Move the viewport, refining the Mandelbrot set progressively and regenerating vector fractals."""
+        if self.current_fractal != "Mandelbrot Set":
+            self.vector_views[self.current_fractal] = bounds
+            self.vector_ax.set_xlim(bounds[0], bounds[1])
+            self.vector_ax.set_ylim(bounds[2], bounds[3])
             self.canvas.draw_idle()
+            # Keep the stretched old figure until the culled geometry arrives
+            self.render()
+            return
+        
+        x_min, x_max, y_min, y_max = bounds
+        if x_max - x_min < FractalGenerator.DEEP_ZOOM_SPAN:
+            # Move the origin to the view centre so the bounds stay small float64 offsets
+            dx, dy = (x_min + x_max) / 2, (y_min + y_max) / 2
+            self.view_origin = offset_point(self.view_origin or (0, 0), dx, dy, x_max - x_min)
+            x_min, x_max, y_min, y_max = x_min - dx, x_max - dx, y_min - dy, y_max - dy
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Error generating fractal: {str(e)}")
+            # Keep the current preview in place until the next pass arrives
+            e_x_min, e_x_max, e_y_min, e_y_max = self.mandelbrot_image.get_extent()
+            self.mandelbrot_image.set_extent((e_x_min - dx, e_x_max - dx, e_y_min - dy, e_y_max - dy))
+            self.fractal_generator.label_mandelbrot_axes(self.mandelbrot_ax, self.view_origin)
+        self.view_bounds = (x_min, x_max, y_min, y_max)
+        self.mandelbrot_ax.set_xlim(x_min, x_max)
+        self.mandelbrot_ax.set_ylim(y_min, y_max)
+        self.canvas.draw_idle()
+        self.request_refinement()
+    
+    def on_scroll(self, event):
+        """Zoom the view around the cursor."""
+        ax = self.zoom_axes()
+        if ax is None or event.inaxes is not ax:
+            return
+        factor = self.ZOOM_FACTOR if event.button == 'up' else 1 / self.ZOOM_FACTOR
+        x_min, x_max, y_min, y_max = self.current_bounds()
+        x, y = event.xdata, event.ydata
+        self.set_view((x - (x - x_min) * factor, x + (x_max - x) * factor,
+                       y - (y - y_min) * factor, y + (y_max - y) * factor))
+    
+    def on_press(self, event):
+        ax = self.zoom_axes()
+        if ax is None or event.inaxes is not ax or event.button != 1:
+            return
+        # Remember screen position, data coordinates shift while the view moves
+        self.pan_start = (event.x, event.y, self.current_bounds())
+    
+    def on_motion(self, event):
+        """Drag the view, only moving the axes limits until the button is released."""
+        ax = self.zoom_axes()
+        if self.pan_start is None or ax is None:
+            return
+        start_x, start_y, (x_min, x_max, y_min, y_max) = self.pan_start
+        dx = (event.x - start_x) * (x_max - x_min) / ax.bbox.width
+        dy = (event.y - start_y) * (y_max - y_min) / ax.bbox.height
+        self.pan_bounds = (x_min - dx, x_max - dx, y_min - dy, y_max - dy)
+        ax.set_xlim(x_min - dx, x_max - dx)
+        ax.set_ylim(y_min - dy, y_max - dy)
+        self.canvas.draw_idle()
+    
+    def on_release(self, event):
+        if self.pan_start is None:
+            return
+        self.pan_start = None
+        if self.zoom_axes() is not None and self.pan_bounds is not None:
+            self.set_view(self.pan_bounds)
+        self.pan_bounds = None
+    
+    def request_refinement(self, steps=None):
+        """Render the current view in passes of increasing resolution on the worker thread."""
+        # Submitting supersedes passes still running for older views
+        self.scheduler.submit(self.refine_mandelbrot, self.apply_refinement, self.view_bounds, self.view_origin,
+                              self.mandelbrot_max_iter(), steps or self.REFINE_STEPS)
+    
+    def refine_mandelbrot(self, bounds, origin, max_iter, steps):
+        """Worker thread: yield one iteration buffer per refinement pass, coarse to fine."""
+        done = len(self.REFINE_STEPS) - len(steps)
+        for number, step in enumerate(steps, done + 1):
+            size = self.MANDELBROT_RESOLUTION // step
+            yield number, bounds, self.cached_mandelbrot(bounds, origin, max_iter, size)
+    
+    def apply_refinement(self, result, seconds):
+        """Tk thread: show a refinement pass in the existing image."""
+        number, bounds, iterations = result
+        if self.mandelbrot_image is None:
+            return
+        if self.scene_var.get():
+            # Blitted unless the colour limits, and so the colorbar, changed
+            self.scene.update_mandelbrot(iterations, bounds)
+            self.scene.draw()
+        else:
+            # Update the existing image instead of rebuilding the axes
+            self.mandelbrot_image.set_data(iterations)
+            self.mandelbrot_image.set_extent(bounds)
+            self.mandelbrot_image.set_clim(iterations.min(), iterations.max())
+            self.canvas.draw_idle()
+        
+        total = len(self.REFINE_STEPS)
+        size = iterations.shape[1]
+        self.set_status(f"Pass {number}/{total} ({size}x{size}) after {seconds * 1000:.0f} ms", number / total)
     
     def save_image(self):
         """Save the current fractal as an image."""
         try:
             filename = f"{self.current_fractal.lower().replace(' ', '_')}_depth_{self.depth}.png"
-            self.figure.savefig(filename, dpi=300, bbox_inches='tight')
+            if self.raster_var.get() and self.current_fractal != "Mandelbrot Set":
+                # Stream an 8k render band by band on the export worker instead of saving the figure
+                self.set_status(f"Saving {self.EXPORT_WIDTH}px image...", 0.0)
+                lod = self.LOD_THRESHOLD if self.lod_var.get() else 0.0
+                self.exporter.submit(self.export_raster, self.on_image_saved, self.current_fractal, self.depth,
+                                      self.get_color_palette(), filename, self.current_bounds(), lod)
+                return
+            if self.scene_var.get():
+                self.scene.savefig(filename, dpi=300, bbox_inches='tight')
+            else:
+                self.figure.savefig(filename, dpi=300, bbox_inches='tight')
             messagebox.showinfo("Success", f"Image saved as {filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Error saving image: {str(e)}")
+    
+    def export_raster(self, fractal, depth, palette, filename, bounds, lod):
+        """Export worker: rasterize the current view at EXPORT_WIDTH straight to a PNG file.
+        
+        The geometry is streamed in chunks for every band, so the export never holds it whole.
+        """
+        return self.rasterize_geometry(fractal, depth, None, palette, self.EXPORT_WIDTH, filename, bounds, lod)
+    
+    def on_image_saved(self, filename, seconds):
+        self.set_status(f"Saved in {seconds:.1f} s", 1.0)
+        messagebox.showinfo("Success", f"Image saved as {filename}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,114 @@
+"""Colour schemes compiled once into NumPy lookup tables.
+
+A Palette interpolates its colour stops in HSV (the depth gradients) or RGB
+(the Mandelbrot colormap) for whole arrays at a time, so colouring never has
+to parse hex strings or loop over colorsys in the drawing hot path.
+"""
+import colorsys
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from matplotlib.colors import ListedColormap
+
+COLOR_SCHEMES = {
+    "Vibrant": ["#e74c3c", "#f39c12", "#f1c40f", "#2ecc71", "#3498db", "#9b59b6", "#e91e63"],
+    "Ocean": ["#1abc9c", "#16a085", "#3498db", "#2980b9", "#34495e", "#2c3e50", "#95a5a6"],
+    "Sunset": ["#ff7675", "#fd79a8", "#fdcb6e", "#e17055", "#d63031", "#74b9ff", "#0984e3"],
+    "Forest": ["#00b894", "#00cec9", "#55a3ff", "#74b9ff", "#a29bfe", "#6c5ce7", "#fd79a8"],
+    "Fire": ["#ff6b6b", "#ffa726", "#ffca28", "#66bb6a", "#42a5f5", "#ab47bc", "#ef5350"],
+    "Pastel": ["#ff9ff3", "#54a0ff", "#5f27cd", "#00d2d3", "#ff9f43", "#10ac84", "#ee5a24"]
+}
+
+# Default Mandelbrot colours, blended in RGB
+MANDELBROT_COLORS = ['#000428', '#004e92', '#009ffd', '#2a2a72', '#ff6b6b', '#feca57', '#48dbfb', '#ff9ff3']
+
+
+def _hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """Vectorised colorsys.hsv_to_rgb, step for step so results match it exactly."""
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = (h * 6.0).astype(int)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+
+    choices = [np.stack(channels, axis=-1) for channels in
+               [(v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q)]]
+    rgb = np.select([(i == k)[..., np.newaxis] for k in range(6)], choices)
+    # colorsys returns (v, v, v) for grey without going through the sector formula
+    return np.where((s == 0.0)[..., np.newaxis], np.stack([v, v, v], axis=-1), rgb)
+
+
+class Palette:
+    """Colour stops compiled into an RGBA lookup table with vectorised interpolation."""
+
+    def __init__(self, colors: Sequence[str], space: str = 'hsv', size: int = 256):
+        self.colors = tuple(colors)
+        self.space = space
+
+        rgb = [tuple(int(color.lstrip('#')[i:i+2], 16) / 255.0 for i in (0, 2, 4)) for color in self.colors]
+        if space == 'hsv':
+            self.stops = np.array([colorsys.rgb_to_hsv(*color) for color in rgb])
+        else:
+            self.stops = np.array(rgb)
+
+        self.table = self.rgba(np.linspace(0, 1, size))
+        self.table_uint8 = np.round(self.table * 255).astype(np.uint8)
+        self._colormap = None
+        self._hex = {}
+
+    def rgba(self, t) -> np.ndarray:
+        """Colours at positions t in [0, 1] as an (..., 4) float array."""
+        t = np.clip(np.asarray(t, dtype=float), 0.0, 1.0)
+        index = t * (len(self.stops) - 1)
+        lower = index.astype(int)
+        upper = np.minimum(lower + 1, len(self.stops) - 1)
+        fraction = (index - lower)[..., np.newaxis]
+
+        # Same blend as create_gradient_color: a + t * (b - a) per channel
+        blended = self.stops[lower] + fraction * (self.stops[upper] - self.stops[lower])
+        rgb = _hsv_to_rgb(blended) if self.space == 'hsv' else blended
+        return np.concatenate([rgb, np.ones(rgb.shape[:-1] + (1,))], axis=-1)
+
+    def hex(self, t: float) -> str:
+        """Colour at position t as a '#rrggbb' string, memoised per position."""
+        if t not in self._hex:
+            rgb = self.rgba(t)[:3]
+            self._hex[t] = '#' + ''.join(f'{int(c*255):02x}' for c in rgb)
+        return self._hex[t]
+
+    def map(self, values, vmin: float = None, vmax: float = None) -> np.ndarray:
+        """Look up (..., 4) uint8 RGBA colours for an array of depths or iteration counts."""
+        values = np.asarray(values, dtype=float)
+        vmin = values.min() if vmin is None else vmin
+        vmax = values.max() if vmax is None else vmax
+        size = len(self.table_uint8)
+        # Binned like matplotlib's Normalize and colormap, as imshow colours the buffer: size equal
+        # bins over [vmin, vmax], vmax itself in the last one
+        normalized = (values - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(values)
+        index = np.clip(normalized * size, 0, size - 1).astype(int)
+        return self.table_uint8[index]
+
+    @property
+    def colormap(self) -> ListedColormap:
+        """Matplotlib colormap backed by the lookup table, built on first use."""
+        if self._colormap is None:
+            self._colormap = ListedColormap(self.table, name='palette')
+        return self._colormap
+
+
+@lru_cache(maxsize=None)
+def _compile(colors: tuple, space: str, size: int) -> Palette:
+    return Palette(colors, space, size)
+
+
+def get_palette(colors: Sequence[str], space: str = 'hsv', size: int = 256) -> Palette:
+    """Compiled Palette for a list of hex colours, built once per (colors, space, size)."""
+    return _compile(tuple(colors), space, size)
+
+
+def mandelbrot_palette(colors: Sequence[str] = None) -> Palette:
+    """Compiled RGB palette for the Mandelbrot colormap, the default colours unless given."""
+    return get_palette(colors or MANDELBROT_COLORS, space='rgb')
@@ -0,0 +1,279 @@
+"""Direct-to-raster drawing of fractal geometry into NumPy framebuffers.
+
+A Rasterizer covers one horizontal band of an image, so large exports can be
+drawn band by band and streamed to PNG without ever holding the full image.
+Triangles are scanline filled, lines are drawn anti-aliased with fractional
+coverage, and both are alpha blended onto an RGB float buffer level by level,
+the same order matplotlib draws the collections in.
+"""
+import struct
+import zlib
+from typing import Callable, Tuple
+
+import numpy as np
+
+# Upper bound on scanline spans or line samples processed in one vectorised step
+CHUNK = 1 << 18
+
+
+def _chunks(counts: np.ndarray):
+    """Split items into consecutive slices whose counts add up to about CHUNK each."""
+    group = np.cumsum(counts) // CHUNK
+    edges = np.concatenate([[0], np.flatnonzero(np.diff(group)) + 1, [len(counts)]])
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            yield slice(start, stop)
+
+
+def _accumulate(target: np.ndarray, index: np.ndarray, weights):
+    """target[index] += weights with repeated indices, counting only the touched range."""
+    if len(index) == 0:
+        return
+    lo, hi = index.min(), index.max() + 1
+    if np.isscalar(weights):
+        target[lo:hi] += (np.bincount(index - lo, minlength=hi - lo) * weights).astype(target.dtype)
+    else:
+        target[lo:hi] += np.bincount(index - lo, weights=weights, minlength=hi - lo).astype(target.dtype)
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For items repeated counts times, return each repeat's item index and its 0-based offset."""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, offsets
+
+
+class Rasterizer:
+    """RGB framebuffer for rows [row_start, row_stop) of a width x height image of viewport."""
+
+    def __init__(self, width: int, height: int, viewport: Tuple[float, float, float, float],
+                 row_start: int = 0, row_stop: int = None, dpi: float = 100,
+                 background: Tuple[float, float, float] = (1.0, 1.0, 1.0)):
+        self.width = width
+        self.height = height
+        self.viewport = viewport
+        self.row_start = row_start
+        self.row_stop = height if row_stop is None else row_stop
+        self.rows = self.row_stop - self.row_start
+        # Line widths are given in points like matplotlib's
+        self.pixels_per_point = dpi / 72
+        # One plane per channel so blending gathers contiguous values
+        self.rgb = np.empty((3, self.rows, width), dtype=np.float32)
+        self.rgb[:] = np.asarray(background, dtype=np.float32)[:, np.newaxis, np.newaxis]
+        # Pending coverage, filled by add_triangles / add_segments and consumed by composite
+        self.fill_spans = None
+        self.stroke = None
+
+    @property
+    def pixel_size(self) -> float:
+        """Width of one pixel in data units."""
+        return (self.viewport[1] - self.viewport[0]) / self.width
+
+    def band_viewport(self) -> Tuple[float, float, float, float]:
+        """The data region (x_min, x_max, y_min, y_max) this band covers."""
+        x_min, x_max, y_min, y_max = self.viewport
+        row_height = (y_max - y_min) / self.height
+        return (x_min, x_max, y_max - self.row_stop * row_height, y_max - self.row_start * row_height)
+
+    def to_pixels(self, points: np.ndarray) -> np.ndarray:
+        """Map data coordinates to (column, row) pixel coordinates within this band."""
+        x_min, x_max, y_min, y_max = self.viewport
+        pixels = np.empty(points.shape, dtype=float)
+        pixels[..., 0] = (points[..., 0] - x_min) * (self.width / (x_max - x_min))
+        pixels[..., 1] = (y_max - points[..., 1]) * (self.height / (y_max - y_min)) - self.row_start
+        return pixels
+
+    def blend(self, coverage: np.ndarray, color, alpha: float):
+        """Composite color over the buffer with per-pixel coverage in [0, 1]."""
+        # Only touch covered pixels, most levels cover a small part of the band
+        covered = np.flatnonzero(coverage)
+        weight = np.minimum(coverage.ravel()[covered], 1.0) * np.float32(alpha)
+        for channel, value in zip(self.rgb.reshape(3, -1), color[:3]):
+            current = channel[covered]
+            channel[covered] = current + weight * (np.float32(value) - current)
+
+    def add_triangles(self, triangles: np.ndarray):
+        """Scanline fill an (N, 3, 2) array of non-overlapping triangles into the pending fill.
+
+        Pixels whose centre lies inside a triangle are covered. Spans are marked
+        in a per-row difference array that composite() expands with a cumulative
+        sum, so the cost grows with the number of rows crossed rather than with
+        the area, and triangles can be added in as many chunks as needed.
+        """
+        if self.fill_spans is None:
+            self.fill_spans = np.zeros(self.rows * (self.width + 1), dtype=np.int32)
+        pixels = self.to_pixels(triangles)
+        x, y = pixels[..., 0], pixels[..., 1]
+
+        # Rows whose centre falls inside each triangle's vertical extent, clipped to the band
+        first = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, self.rows).astype(int)
+        last = np.clip(np.floor(y.max(axis=1) - 0.5) + 1, 0, self.rows).astype(int)
+        visible = (last > first) & (x.max(axis=1) >= 0) & (x.min(axis=1) <= self.width)
+        x, y, first, last = x[visible], y[visible], first[visible], last[visible]
+
+        for chunk in _chunks(last - first):
+            # One (triangle, row) pair per scanline
+            owner, offsets = _expand(last[chunk] - first[chunk])
+            rows = first[chunk][owner] + offsets
+            yc = rows + 0.5
+            tx, ty = x[chunk][owner], y[chunk][owner]
+
+            # Intersect the scanline with all three edges, keeping the outermost crossings
+            left = np.full(len(rows), np.inf)
+            right = np.full(len(rows), -np.inf)
+            for a, b in ((0, 1), (1, 2), (2, 0)):
+                ya, yb = ty[:, a], ty[:, b]
+                crosses = (np.minimum(ya, yb) <= yc) & (yc < np.maximum(ya, yb))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    xi = tx[:, a] + (yc - ya) * (tx[:, b] - tx[:, a]) / (yb - ya)
+                left = np.where(crosses, np.minimum(left, xi), left)
+                right = np.where(crosses, np.maximum(right, xi), right)
+
+            # Pixel columns whose centre lies in [left, right)
+            col0 = np.clip(np.ceil(left - 0.5), 0, self.width).astype(int)
+            col1 = np.clip(np.ceil(right - 0.5), 0, self.width).astype(int)
+            spans = col1 > col0
+            base = rows[spans] * (self.width + 1)
+            _accumulate(self.fill_spans, base + col0[spans], 1)
+            _accumulate(self.fill_spans, base + col1[spans], -1)
+
+    def add_segments(self, segments: np.ndarray, linewidth: float):
+        """Add anti-aliased coverage of an (N, 2, 2) array of line segments to the pending stroke.
+
+        linewidth is in points. Each segment is sampled once per pixel along its
+        major axis; at every sample the stroke's cross-section is spread over the
+        neighbouring pixels by overlap. Segments shorter than a pixel leave one
+        sample weighted by their length.
+        """
+        if self.stroke is None:
+            self.stroke = np.zeros(self.rows * self.width, dtype=np.float32)
+        width = linewidth * self.pixels_per_point
+        pixels = self.to_pixels(segments)
+
+        # Drop segments that are entirely outside the band
+        reach = width + 1
+        x, y = pixels[..., 0], pixels[..., 1]
+        visible = ((x.max(axis=1) >= -reach) & (x.min(axis=1) <= self.width + reach) &
+                   (y.max(axis=1) >= -reach) & (y.min(axis=1) <= self.rows + reach))
+        pixels = pixels[visible]
+
+        # Handle x-major and y-major segments by swapping axes for the latter
+        steep = np.abs(pixels[:, 1, 1] - pixels[:, 0, 1]) > np.abs(pixels[:, 1, 0] - pixels[:, 0, 0])
+        for swap in (False, True):
+            part = pixels[steep == swap]
+            if swap:
+                part = part[..., ::-1]
+            # Roughly one sample per pixel of major-axis length
+            lengths = np.abs(part[:, 1, 0] - part[:, 0, 0]).astype(int) + 1
+            for chunk in _chunks(lengths):
+                self._accumulate_line_chunk(part[chunk], width, swap)
+
+    def _accumulate_line_chunk(self, segments: np.ndarray, width: float, swap: bool):
+        # Orient so that the major coordinate increases along each segment
+        flip = segments[:, 0, 0] > segments[:, 1, 0]
+        segments = np.where(flip[:, np.newaxis, np.newaxis], segments[:, ::-1], segments)
+        u0, v0 = segments[:, 0, 0], segments[:, 0, 1]
+        u1, v1 = segments[:, 1, 0], segments[:, 1, 1]
+        du = u1 - u0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(du > 0, (v1 - v0) / du, 0.0)
+
+        # Sample at pixel centres along the major axis, or once at the midpoint for tiny segments
+        major_size, minor_size = (self.rows, self.width) if swap else (self.width, self.rows)
+        first = np.ceil(u0 - 0.5)
+        last = np.floor(u1 - 0.5)
+        tiny = last < first
+        first[tiny] = last[tiny] = np.floor((u0[tiny] + u1[tiny]) / 2)
+        weight = np.where(tiny, np.hypot(du, v1 - v0), 1.0)
+        # Only sample the part of each segment inside the band
+        first = np.maximum(first, 0)
+        counts = np.maximum(np.minimum(last, major_size - 1) - first + 1, 0).astype(int)
+
+        owner, offsets = _expand(counts)
+        u = first[owner] + offsets
+        v = v0[owner] + (u + 0.5 - u0[owner]) * slope[owner]
+        # A stroke of perpendicular width w spans w * sqrt(1 + slope^2) across the minor axis
+        half = 0.5 * width * np.sqrt(1 + slope[owner] ** 2)
+        lo, hi = v - half, v + half
+        sample_weight = weight[owner]
+
+        u = u.astype(int)
+        base = np.floor(lo).astype(int)
+        indices, weights = [], []
+        for k in range(int(np.ceil(half.max() if len(half) else 0)) * 2 + 2):
+            minor = base + k
+            overlap = np.clip(np.minimum(minor + 1, hi) - np.maximum(minor, lo), 0.0, 1.0) * sample_weight
+            inside = (overlap > 0) & (u >= 0) & (u < major_size) & (minor >= 0) & (minor < minor_size)
+            if swap:
+                indices.append(u[inside] * self.width + minor[inside])
+            else:
+                indices.append(minor[inside] * self.width + u[inside])
+            weights.append(overlap[inside])
+        if indices:
+            _accumulate(self.stroke, np.concatenate(indices), np.concatenate(weights))
+
+    def composite(self, fill_color=None, fill_alpha: float = 1.0, stroke_color=None, stroke_alpha: float = 1.0):
+        """Blend the pending fill, then the pending stroke, over the buffer and clear both.
+
+        Everything added since the last composite is blended at once, like the
+        paths of one matplotlib artist, so overlaps never darken twice.
+        """
+        if self.fill_spans is not None:
+            if fill_color is not None:
+                spans = np.cumsum(self.fill_spans.reshape(self.rows, self.width + 1), axis=1)[:, :self.width]
+                self.blend((spans > 0).astype(np.float32), fill_color, fill_alpha)
+            self.fill_spans = None
+        if self.stroke is not None:
+            if stroke_color is not None:
+                self.blend(self.stroke.reshape(self.rows, self.width), stroke_color, stroke_alpha)
+            self.stroke = None
+
+    def fill_triangles(self, triangles: np.ndarray, color, alpha: float = 1.0):
+        self.add_triangles(triangles)
+        self.composite(fill_color=color, fill_alpha=alpha)
+
+    def stroke_segments(self, segments: np.ndarray, color, alpha: float = 1.0, linewidth: float = 1.0):
+        self.add_segments(segments, linewidth)
+        self.composite(stroke_color=color, stroke_alpha=alpha)
+
+    def stroke_polyline(self, vertices: np.ndarray, color, alpha: float = 1.0, linewidth: float = 1.0):
+        self.stroke_segments(np.stack([vertices[:-1], vertices[1:]], axis=1), color, alpha, linewidth)
+
+    def image(self) -> np.ndarray:
+        """The band as an opaque (rows, width, 4) uint8 RGBA array."""
+        rgba = np.empty((self.rows, self.width, 4), dtype=np.uint8)
+        rgba[..., :3] = np.round(np.clip(self.rgb, 0, 1) * 255).transpose(1, 2, 0)
+        rgba[..., 3] = 255
+        return rgba
+
+
+def rasterize(draw: Callable[[Rasterizer], None], width: int, height: int,
+              viewport: Tuple[float, float, float, float], dpi: float = 100) -> np.ndarray:
+    """Draw a whole image in one band and return it as (height, width, 4) uint8 RGBA."""
+    raster = Rasterizer(width, height, viewport, dpi=dpi)
+    draw(raster)
+    return raster.image()
+
+
+def rasterize_to_png(path: str, draw: Callable[[Rasterizer], None], width: int, height: int,
+                     viewport: Tuple[float, float, float, float], dpi: float = 100, band_rows: int = 256):
+    """Draw an image band by band and stream it to an RGB PNG, holding one band at a time."""
+    with open(path, 'wb') as f:
+        def chunk(kind: bytes, data: bytes):
+            f.write(struct.pack('>I', len(data)) + kind + data)
+            f.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+        f.write(b'\x89PNG\r\n\x1a\n')
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        compressor = zlib.compressobj(6)
+        for row_start in range(0, height, band_rows):
+            raster = Rasterizer(width, height, viewport, row_start, min(row_start + band_rows, height), dpi)
+            draw(raster)
+            rows = raster.image()[..., :3]
+            # Filter type 0 (None) byte in front of every scanline
+            scanlines = np.concatenate([np.zeros((len(rows), 1), dtype=np.uint8), rows.reshape(len(rows), -1)], axis=1)
+            data = compressor.compress(scanlines.tobytes())
+            if data:
+                chunk(b'IDAT', data)
+        chunk(b'IDAT', compressor.flush())
+        chunk(b'IEND', b'')
@@ -0,0 +1,244 @@
+"""Persistent GUI figure: one axes per fractal whose artists are updated in place.
+
+Rebuilding the figure on every render redoes the axes, ticks, colorbar and
+layout even when only the data changed. FractalScene keeps the axes and
+artists of each fractal type, swaps new data into them (set_paths, set_data,
+set_clim) and, when nothing but that data changed, blits the animated data
+artists over a background cached after the last full draw. Images stay part
+of the full draw, since blitting them would cover the grid drawn above them.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.collections import PathCollection
+from matplotlib.patches import Polygon
+
+from fractal_palette import mandelbrot_palette
+
+# Axis labels of the vector fractals, X and Y unless listed
+AXIS_LABELS = {"Cantor Set": ('Position', 'Level')}
+
+
+class FractalScene:
+    """The axes, colorbar and data artists of every fractal shown so far on one figure."""
+
+    def __init__(self, figure, generator):
+        self.figure = figure
+        self.canvas = figure.canvas
+        self.generator = generator
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.reset()
+
+    def reset(self):
+        """Clear the figure and forget every axes, e.g. after other code drew on it."""
+        self.figure.clear()
+        self.axes = {}
+        self.artists: Dict[str, dict] = {}
+        self.colorbar = None
+        self.title = None
+        self.fractal = None
+        self.background = None
+        # Set when anything besides the animated data artists changed, so blitting is not enough
+        self.stale = True
+        # Lay out again only when the axes change, not on every full draw, so zooming doesn't shift them
+        self.relayout = True
+
+    def show(self, fractal: str, depth: int, geometry, image: np.ndarray, palette: List[str],
+             viewport: Tuple[float, float, float, float]):
+        """Swap one render into the artists of its fractal, in the formats of FractalGUI.compute_fractal.
+
+        Call draw() afterwards to put it on screen.
+        """
+        ax = self.axes_for(fractal)
+        if fractal != self.fractal:
+            self.switch(fractal)
+        for artist in self.artists[fractal].values():
+            artist.set_visible(False)
+
+        if image is not None:
+            self.update_raster(ax, image, viewport)
+        elif fractal == "Sierpinski Triangle":
+            self.update_sierpinski(ax, depth, geometry, palette)
+        elif fractal == "Koch Snowflake":
+            self.update_koch(ax, depth, geometry, palette)
+        elif fractal == "Cantor Set":
+            self.update_cantor(ax, depth, geometry, palette)
+        elif fractal == "Mandelbrot Set":
+            bounds, origin, _, iterations = geometry
+            self.update_mandelbrot(iterations, bounds)
+            xlabel = ax.get_xlabel()
+            self.generator.label_mandelbrot_axes(ax, origin)
+            self.stale |= ax.get_xlabel() != xlabel
+
+        x_min, x_max, y_min, y_max = viewport
+        if ax.get_xlim() != (x_min, x_max) or ax.get_ylim() != (y_min, y_max):
+            # New ticks, so the background has to be redrawn
+            ax.set_xlim(x_min, x_max)
+            ax.set_ylim(y_min, y_max)
+            self.stale = True
+        self.title.set_text(f"{fractal} (Depth: {depth})")
+
+    def axes_for(self, fractal: str):
+        """Axes of a fractal, created with its static decoration the first time it is shown."""
+        if fractal not in self.axes:
+            ax = self.figure.add_subplot(111)
+            ax.set_aspect('equal')
+            ax.grid(True, alpha=0.3)
+            if fractal == "Mandelbrot Set":
+                ax.set_title('Mandelbrot Set', fontsize=14, pad=20)
+            else:
+                xlabel, ylabel = AXIS_LABELS.get(fractal, ('X', 'Y'))
+                ax.set_xlabel(xlabel, fontsize=12)
+                ax.set_ylabel(ylabel, fontsize=12)
+            self.axes[fractal] = ax
+            self.artists[fractal] = {}
+        if self.title is None:
+            self.title = self.figure.suptitle("", fontsize=14, y=0.95, color='#333333')
+            self.title.set_animated(True)
+        return self.axes[fractal]
+
+    def switch(self, fractal: str):
+        """Put only the axes (and colorbar) of fractal on the figure, so the layout ignores the others."""
+        for ax in list(self.figure.axes):
+            self.figure.delaxes(ax)
+        self.figure.add_axes(self.axes[fractal])
+        if fractal == "Mandelbrot Set" and self.colorbar is not None:
+            self.figure.add_axes(self.colorbar.ax)
+        self.fractal = fractal
+        self.stale = True
+        self.relayout = True
+
+    def add(self, fractal: str, name: str, artist, animated: bool = True):
+        """Register a data artist, animated ones are left out of full draws and blitted instead."""
+        artist.set_animated(animated)
+        self.artists[fractal][name] = artist
+        return artist
+
+    def update_raster(self, ax, image: np.ndarray, viewport: Tuple[float, float, float, float]):
+        """Raster renderer: the whole vector fractal is a single image."""
+        artists = self.artists[self.fractal]
+        with self.generator.stage('artists'):
+            if 'raster' not in artists:
+                self.add(self.fractal, 'raster', ax.imshow(image, extent=viewport, interpolation='nearest'),
+                         animated=False)
+            artists['raster'].set_data(image)
+            artists['raster'].set_extent(viewport)
+            artists['raster'].set_visible(True)
+        self.stale = True
+
+    def update_sierpinski(self, ax, depth: int, levels: List[np.ndarray], palette: List[str]):
+        with self.generator.stage('colour'):
+            face_colors, edge_colors, linewidths = self.generator.sierpinski_style(depth, len(levels), palette,
+                                                                                  max(7, depth))
+        with self.generator.stage('artists'):
+            collection = self.artists["Sierpinski Triangle"].get('triangles')
+            if collection is None:
+                collection = self.add("Sierpinski Triangle", 'triangles', ax.add_collection(PathCollection([])))
+            collection.set_paths([self.generator.triangles_to_path(triangles) for triangles in levels])
+            collection.set_facecolor(face_colors)
+            collection.set_edgecolor(edge_colors)
+            collection.set_linewidth(linewidths)
+            collection.set_visible(True)
+
+    def update_koch(self, ax, depth: int, vertices: np.ndarray, palette: List[str]):
+        with self.generator.stage('colour'):
+            color = self.generator.create_gradient_color(palette, min(depth, 7), 7)
+        with self.generator.stage('artists'):
+            artists = self.artists["Koch Snowflake"]
+            if depth == 0:
+                # Same simple triangle as koch_snowflake draws at depth 0
+                if 'triangle' not in artists:
+                    self.add("Koch Snowflake", 'triangle',
+                             ax.add_patch(Polygon(vertices[:-1], fill=False, linewidth=2, alpha=0.9)))
+                outline = artists['triangle']
+                outline.set_xy(vertices[:-1])
+                outline.set_edgecolor(color)
+            else:
+                if 'outline' not in artists:
+                    self.add("Koch Snowflake", 'outline',
+                             ax.plot([], [], linewidth=self.generator.koch_linewidth(7), alpha=0.9)[0])
+                outline = artists['outline']
+                outline.set_data(vertices[:, 0], vertices[:, 1])
+                outline.set_color(color)
+            outline.set_visible(True)
+
+    def update_cantor(self, ax, depth: int, levels: List[np.ndarray], palette: List[str]):
+        with self.generator.stage('colour'):
+            styles = [self.generator.cantor_style(depth - level, max(7, depth)) for level in range(len(levels))]
+        with self.generator.stage('artists'):
+            artists = self.artists["Cantor Set"]
+            for level, (intervals, (linewidth, alpha)) in enumerate(zip(levels, styles)):
+                # One line per level, added the first time a depth reaches it
+                name = f'level {level}'
+                if name not in artists:
+                    self.add("Cantor Set", name, ax.plot([], [])[0])
+                line = artists[name]
+                line.set_data(*self.generator.cantor_line(intervals, self.generator.CANTOR_Y - 10 * level))
+                line.set_color(palette[0])
+                line.set_linewidth(linewidth)
+                line.set_alpha(alpha)
+                line.set_visible(True)
+
+    def update_mandelbrot(self, iterations: np.ndarray, bounds: Tuple[float, float, float, float]):
+        """Show an iteration buffer over bounds, also for refinement passes of the current view."""
+        ax = self.axes["Mandelbrot Set"]
+        artists = self.artists["Mandelbrot Set"]
+        if 'iterations' not in artists:
+            with self.generator.stage('colour'):
+                cmap = mandelbrot_palette().colormap
+            with self.generator.stage('artists'):
+                image = self.add("Mandelbrot Set", 'iterations',
+                                 ax.imshow(iterations, extent=bounds, cmap=cmap, origin='lower', aspect='equal'),
+                                 animated=False)
+                self.colorbar = self.figure.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+                self.colorbar.set_label('Iterations', rotation=270, labelpad=15)
+        with self.generator.stage('artists'):
+            image = artists['iterations']
+            image.set_data(iterations)
+            image.set_extent(bounds)
+            image.set_clim(iterations.min(), iterations.max())
+            image.set_visible(True)
+        self.stale = True
+
+    def draw(self) -> bool:
+        """Put the scene on screen, returning True if blitting the data artists was enough."""
+        if self.relayout:
+            # Start from the default margins, so a fractal is laid out the same whichever was shown before
+            self.figure.subplots_adjust(**{side: rcParams[f'figure.subplot.{side}']
+                                           for side in ('left', 'right', 'bottom', 'top')})
+            self.figure.tight_layout(rect=[0, 0.03, 1, 0.93])
+            self.relayout = False
+        if self.stale or self.background is None:
+            self.canvas.draw()
+            return False
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.figure.bbox)
+        return True
+
+    def on_draw(self, event):
+        """After every full draw, cache the background and paint the animated artists over it."""
+        if self.fractal is None:
+            return
+        if self.canvas.is_saving():
+            # savefig renders at another size, so the cached background no longer matches the screen
+            self.background = None
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.stale = False
+        self.draw_animated()
+
+    def draw_animated(self):
+        for artist in self.artists[self.fractal].values():
+            if artist.get_visible() and artist.get_animated():
+                self.figure.draw_artist(artist)
+        self.figure.draw_artist(self.title)
+
+    def savefig(self, filename: str, **kwargs):
+        """Save the figure, with the title that saving would skip as a figure-level animated artist."""
+        self.title.set_animated(False)
+        try:
+            self.figure.savefig(filename, **kwargs)
+        finally:
+            self.title.set_animated(True)
@@ -0,0 +1,287 @@
+"""Streaming fractal geometry in fixed-size chunks with bounded memory.
+
+Instead of building whole levels, the generators here walk the subdivision
+tree depth first and yield (level, chunk) pairs: (n, 3, 2) triangle arrays or
+(n, 2, 2) segment arrays of exactly chunk_size items, except for the last
+chunk of each level. Levels come root first and the items of a level come in
+the same order as the subdivide kernels in fractal_engine produce them, so a
+stream is deterministic and matches the in-memory geometry item for item.
+Peak memory is about chunk_size items per tree level, however deep it goes.
+
+Given a View, generation is view aware: subtrees whose extent misses the
+visible region are pruned, and subdivision stops at the first level whose
+primitives are smaller than the view's pixel threshold, deeper levels reusing
+those primitives. The work then follows the number of visible pixels instead
+of growing exponentially with depth.
+
+Consumers take any such stream: rasterize_chunks draws into a Rasterizer,
+write_svg writes an SVG file and count_chunks tallies items per level.
+"""
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fractal_engine import cantor_subdivide, koch_subdivide_segments, sierpinski_subdivide
+from fractal_raster import Rasterizer
+
+# Items (triangles or segments) per chunk, 3 MB of triangles
+CHUNK_SIZE = 1 << 16
+
+Chunk = Tuple[int, np.ndarray]
+
+
+class LevelStyle(NamedTuple):
+    """How one level is drawn: RGBA fill and stroke (None to skip) and the stroke width in points."""
+    fill: Optional[Tuple[float, float, float, float]] = None
+    stroke: Optional[Tuple[float, float, float, float]] = None
+    linewidth: float = 1.0
+
+
+class View(NamedTuple):
+    """Visible region in data coordinates and the data size of one screen pixel.
+
+    threshold is the primitive size in pixels below which subdivision stops, 0
+    to only prune by region. margin keeps primitives this many pixels outside the
+    region, so strokes crossing the border are still drawn.
+    """
+    viewport: Tuple[float, float, float, float]
+    pixel_size: float
+    threshold: float = 1.0
+    margin: float = 8.0
+
+    @classmethod
+    def from_axes(cls, ax, threshold: float = 1.0) -> 'View':
+        """View of a matplotlib axes from its limits and its data to display transform."""
+        x_min, x_max = sorted(ax.get_xlim())
+        y_min, y_max = sorted(ax.get_ylim())
+        (x0, y0), (x1, y1) = ax.transData.transform([(x_min, y_min), (x_max, y_max)])
+        pixel_size = min((x_max - x_min) / max(abs(x1 - x0), 1), (y_max - y_min) / max(abs(y1 - y0), 1))
+        return cls((x_min, x_max, y_min, y_max), pixel_size, threshold)
+
+    @classmethod
+    def for_image(cls, viewport: Tuple[float, float, float, float], width: int, threshold: float = 1.0) -> 'View':
+        """View of an image width pixels wide showing viewport with square pixels."""
+        return cls(tuple(viewport), (viewport[1] - viewport[0]) / width, threshold)
+
+    def lod_level(self, size: float, depth: int, ratio: float) -> int:
+        """Deepest level to subdivide to when primitives start size units wide and shrink by ratio per level."""
+        level = 0
+        while level < depth and size * ratio ** level >= self.threshold * self.pixel_size:
+            level += 1
+        return level
+
+    def visible(self, x_min: np.ndarray, x_max: np.ndarray, y_min: np.ndarray, y_max: np.ndarray) -> np.ndarray:
+        """Mask of the bounding boxes that overlap the region plus its margin."""
+        v_x_min, v_x_max, v_y_min, v_y_max = self.viewport
+        margin = self.margin * self.pixel_size
+        return ((x_max >= v_x_min - margin) & (x_min <= v_x_max + margin) &
+                (y_max >= v_y_min - margin) & (y_min <= v_y_max + margin))
+
+
+def _triangles_visible(view: View, triangles: np.ndarray) -> np.ndarray:
+    # Children lie inside their parent, so a triangle's box bounds its whole subtree
+    x, y = triangles[..., 0], triangles[..., 1]
+    return view.visible(x.min(axis=1), x.max(axis=1), y.min(axis=1), y.max(axis=1))
+
+
+def _koch_visible(view: View, segments: np.ndarray) -> np.ndarray:
+    # The curve over a segment stays inside the triangle under its first bump
+    start, end = segments[:, 0], segments[:, 1]
+    delta = end - start
+    apex = (start + end) / 2 + np.stack([-delta[:, 1], delta[:, 0]], axis=1) * (np.sqrt(3) / 6)
+    corners = np.stack([start, end, apex], axis=1)
+    x, y = corners[..., 0], corners[..., 1]
+    return view.visible(x.min(axis=1), x.max(axis=1), y.min(axis=1), y.max(axis=1))
+
+
+def _intervals_visible(view: View, y: float, intervals: np.ndarray) -> np.ndarray:
+    return view.visible(intervals[:, 0], intervals[:, 1], y, y)
+
+
+def _descend(items: np.ndarray, levels: int, subdivide: Callable, branching: int, chunk_size: int,
+             keep: Optional[Callable] = None) -> Iterator[np.ndarray]:
+    """Yield the descendants `levels` subdivisions below items, in order, at most chunk_size at a time.
+
+    keep(items) returns a mask of items whose subtrees can reach the visible region,
+    the others are dropped before they are subdivided.
+    """
+    if keep is not None:
+        items = items[keep(items)]
+    leaves = branching ** levels
+    if leaves <= chunk_size:
+        group = chunk_size // leaves
+        for start in range(0, len(items), group):
+            part = items[start:start + group]
+            for _ in range(levels):
+                part = subdivide(part)
+                if keep is not None:
+                    part = part[keep(part)]
+            yield part
+    else:
+        # Too many leaves below each item: go one level down a slice at a time
+        group = max(1, chunk_size // branching)
+        for start in range(0, len(items), group):
+            yield from _descend(subdivide(items[start:start + group]), levels - 1, subdivide, branching,
+                                chunk_size, keep)
+
+
+def _fixed_size(pieces: Iterable[np.ndarray], chunk_size: int) -> Iterator[np.ndarray]:
+    """Regroup a stream of arrays into chunks of exactly chunk_size rows, the last one shorter."""
+    buffer, buffered = [], 0
+    for piece in pieces:
+        while len(piece):
+            take = min(chunk_size - buffered, len(piece))
+            buffer.append(piece[:take])
+            buffered += take
+            piece = piece[take:]
+            if buffered == chunk_size:
+                yield buffer[0] if len(buffer) == 1 else np.concatenate(buffer)
+                buffer, buffered = [], 0
+    if buffered:
+        yield buffer[0] if len(buffer) == 1 else np.concatenate(buffer)
+
+
+def level_chunks(root: np.ndarray, level: int, subdivide: Callable, branching: int,
+                 chunk_size: int = CHUNK_SIZE, keep: Optional[Callable] = None) -> Iterator[np.ndarray]:
+    """Stream one subdivision level of root in fixed-size chunks without building the level."""
+    return _fixed_size(_descend(root, level, subdivide, branching, chunk_size, keep), chunk_size)
+
+
+def sierpinski_chunks(points: Sequence[Tuple[float, float]], depth: int, chunk_size: int = CHUNK_SIZE,
+                      view: Optional[View] = None) -> Iterator[Chunk]:
+    """(level, (n, 3, 2) triangles) for every level from 0 to depth."""
+    root = np.asarray(points, dtype=float).reshape(1, 3, 2)
+    keep = lod = None
+    if view is not None:
+        keep = partial(_triangles_visible, view)
+        lod = view.lod_level(np.ptp(root[0], axis=0).max(), depth, 0.5)
+    for level in range(depth + 1):
+        geometry_level = level if lod is None else min(level, lod)
+        for chunk in level_chunks(root, geometry_level, sierpinski_subdivide, 3, chunk_size, keep):
+            yield level, chunk
+
+
+def koch_chunks(points: Sequence[Tuple[float, float]], depth: int, chunk_size: int = CHUNK_SIZE,
+                view: Optional[View] = None) -> Iterator[Chunk]:
+    """(depth, (n, 2, 2) segments) of the Koch curve over a polyline, only the finished level."""
+    vertices = np.asarray(points, dtype=float)
+    root = np.stack([vertices[:-1], vertices[1:]], axis=1)
+    keep = None
+    geometry_level = depth
+    if view is not None:
+        keep = partial(_koch_visible, view)
+        lengths = np.hypot(*(root[:, 1] - root[:, 0]).T)
+        geometry_level = view.lod_level(lengths.max(), depth, 1 / 3)
+    for chunk in level_chunks(root, geometry_level, koch_subdivide_segments, 4, chunk_size, keep):
+        yield depth, chunk
+
+
+def cantor_chunks(intervals: Sequence[Tuple[float, float]], depth: int, y_pos: float, spacing: float = 10,
+                  chunk_size: int = CHUNK_SIZE, view: Optional[View] = None) -> Iterator[Chunk]:
+    """(level, (n, 2, 2) horizontal segments) for every level, level k drawn at y_pos - spacing * k."""
+    root = np.asarray(intervals, dtype=float).reshape(-1, 2)
+    lod = None
+    if view is not None:
+        lod = view.lod_level(np.max(root[:, 1] - root[:, 0]), depth, 1 / 3)
+    for level in range(depth + 1):
+        y = y_pos - spacing * level
+        keep = None
+        if view is not None:
+            if not view.visible(root[:, 0].min(), root[:, 1].max(), y, y):
+                continue
+            keep = partial(_intervals_visible, view, y)
+        geometry_level = level if lod is None else min(level, lod)
+        for chunk in level_chunks(root, geometry_level, cantor_subdivide, 2, chunk_size, keep):
+            segments = np.empty((len(chunk), 2, 2))
+            segments[:, :, 0] = chunk
+            segments[:, :, 1] = y
+            yield level, segments
+
+
+def triangle_edges(triangles: np.ndarray) -> np.ndarray:
+    """The (3N, 2, 2) outline segments of an (N, 3, 2) triangle array."""
+    return np.stack([triangles, np.roll(triangles, -1, axis=1)], axis=2).reshape(-1, 2, 2)
+
+
+def count_chunks(chunks: Iterable[Chunk]) -> Dict[int, int]:
+    """Number of items per level in a stream."""
+    counts = {}
+    for level, chunk in chunks:
+        counts[level] = counts.get(level, 0) + len(chunk)
+    return counts
+
+
+def rasterize_chunks(raster: Rasterizer, chunks: Iterable[Chunk], styles: Mapping[int, LevelStyle]):
+    """Draw a stream into a Rasterizer, blending every level once like a single matplotlib artist."""
+    def composite(level):
+        style = styles[level]
+        raster.composite(style.fill, style.fill[3] if style.fill else 1.0,
+                         style.stroke, style.stroke[3] if style.stroke else 1.0)
+
+    current = None
+    for level, chunk in chunks:
+        if level != current:
+            if current is not None:
+                composite(current)
+            current = level
+        style = styles[level]
+        if chunk.shape[1] == 3:
+            if style.fill is not None:
+                raster.add_triangles(chunk)
+            if style.stroke is not None:
+                raster.add_segments(triangle_edges(chunk), style.linewidth)
+        elif style.stroke is not None:
+            raster.add_segments(chunk, style.linewidth)
+    if current is not None:
+        composite(current)
+
+
+def _svg_color(rgba: Tuple[float, ...]) -> str:
+    return '#' + ''.join(f'{int(round(c * 255)):02x}' for c in rgba[:3])
+
+
+def write_svg(path: str, chunks: Iterable[Chunk], styles: Mapping[int, LevelStyle],
+              viewport: Tuple[float, float, float, float], width: int = 800, dpi: float = 100,
+              precision: int = 3):
+    """Stream a chunk stream into an SVG file, one <path> per chunk and one <g> per level.
+
+    Coordinates stay in data units with y flipped; line widths in points are
+    converted as if the image were width pixels wide at dpi.
+    """
+    x_min, x_max, y_min, y_max = viewport
+    x_span, y_span = x_max - x_min, y_max - y_min
+    height = round(width * y_span / x_span)
+    units_per_point = dpi / 72 * x_span / width
+    point = f'%.{precision}f %.{precision}f'
+
+    with open(path, 'w') as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="{x_min} {-y_max} {x_span} {y_span}">\n')
+        f.write(f'<rect x="{x_min}" y="{-y_max}" width="{x_span}" height="{y_span}" fill="white"/>\n')
+
+        current = None
+        for level, chunk in chunks:
+            if level != current:
+                if current is not None:
+                    f.write('</g>\n')
+                current = level
+                style = styles[level]
+                fill = (f'fill="{_svg_color(style.fill)}" fill-opacity="{style.fill[3]:.3f}"'
+                        if style.fill is not None else 'fill="none"')
+                stroke = (f'stroke="{_svg_color(style.stroke)}" stroke-opacity="{style.stroke[3]:.3f}" '
+                          f'stroke-width="{style.linewidth * units_per_point:.{precision + 2}f}"'
+                          if style.stroke is not None else 'stroke="none"')
+                f.write(f'<g {fill} {stroke} stroke-linejoin="round">\n')
+
+            coordinates = chunk.reshape(len(chunk), -1).copy()
+            coordinates[:, 1::2] *= -1
+            if chunk.shape[1] == 3:
+                item = f'M{point} L{point} L{point} Z '
+            else:
+                item = f'M{point} L{point} '
+            f.write('<path d="' + (item * len(chunk)) % tuple(coordinates.ravel()) + '"/>\n')
+
+        if current is not None:
+            f.write('</g>\n')
+        f.write('</svg>\n')
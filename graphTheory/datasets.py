@@ -0,0 +1,159 @@
+"""Cached loaders for the graphTheory datasets.
+
+Each CSV is parsed once with explicit dtypes and parsed dates, cleaned the way
+the notebook does it (dates sorted, rows without the fitted values dropped)
+and stored as one .npy file per column under .cache/. Later loads memory-map
+those columns instead of parsing again, as long as the SHA-256 of the source
+file still matches the one recorded next to them. Text columns are stored as
+categorical codes plus their categories, since object arrays cannot be mapped.
+
+    from datasets import load
+    states = load('us_states')
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent
+CACHE_DIR = DATA_DIR / '.cache'
+# Bump when the cleaning below changes, so caches written by older code are rebuilt
+CACHE_VERSION = 2
+
+# file: source CSV, dtype: passed to read_csv, dates: columns parsed as dates (utc for mixed offsets),
+# dropna: rows dropped when any of these is missing, sort: sort order of the cleaned table
+DATASETS = {
+    'us_states': {
+        'file': 'us-states.csv',
+        'dtype': {'state': 'category', 'fips': 'int16', 'cases': 'int64', 'deaths': 'int64'},
+        'dates': {'date': False},
+        'sort': ['state', 'date'],
+    },
+    'video_games': {
+        'file': 'video games sales.csv',
+        # Year stays float64 as in the notebook, so arithmetic on it doesn't overflow
+        'dtype': {'Rank': 'int32', 'Name': 'category', 'Platform': 'category', 'Year': 'float64',
+                  'Genre': 'category', 'Publisher': 'category', 'NA_Sales': 'float64', 'EU_Sales': 'float64',
+                  'JP_Sales': 'float64', 'Other_Sales': 'float64', 'Global_Sales': 'float64'},
+        'dropna': ['Year', 'Global_Sales'],
+        'sort': ['Year'],
+    },
+    'walmart': {
+        # A CSV despite the extension
+        'file': 'wmt_data.xls',
+        'dtype': {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64',
+                  'adj_close': 'float64', 'volume': 'int64'},
+        'dates': {'date': True},
+        'sort': ['date'],
+    },
+}
+
+
+def source_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse(name: str) -> pd.DataFrame:
+    """Read and clean a dataset from its CSV, without the cache."""
+    spec = DATASETS[name]
+    frame = pd.read_csv(DATA_DIR / spec['file'], dtype=spec['dtype'])
+    for column, utc in spec.get('dates', {}).items():
+        frame[column] = pd.to_datetime(frame[column], utc=utc, errors='coerce')
+    if 'dropna' in spec:
+        frame = frame.dropna(subset=spec['dropna'])
+    return frame.sort_values(spec['sort'], kind='stable').reset_index(drop=True)
+
+
+def write_cache(frame: pd.DataFrame, directory: Path, digest: str):
+    """Store each column as .npy, writing into a temporary directory that replaces the old cache at the end."""
+    temporary = directory.with_name(f'{directory.name}.tmp-{os.getpid()}')
+    shutil.rmtree(temporary, ignore_errors=True)
+    temporary.mkdir(parents=True)
+    columns = []
+    for index, column in enumerate(frame.columns):
+        values = frame[column]
+        entry = {'name': column, 'file': f'{index}.npy'}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            entry['categories'] = f'{index}.categories.npy'
+            np.save(temporary / entry['categories'], values.cat.categories.to_numpy(dtype=str))
+            np.save(temporary / entry['file'], values.cat.codes.to_numpy())
+        elif isinstance(values.dtype, pd.DatetimeTZDtype):
+            entry['kind'] = 'datetime'
+            entry['tz'] = str(values.dt.tz)
+            np.save(temporary / entry['file'], values.dt.tz_convert(None).to_numpy())
+        else:
+            entry['kind'] = 'values'
+            np.save(temporary / entry['file'], values.to_numpy())
+        columns.append(entry)
+    meta = {'version': CACHE_VERSION, 'source_sha256': digest, 'rows': len(frame), 'columns': columns}
+    (temporary / 'meta.json').write_text(json.dumps(meta, indent=2))
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temporary, directory)
+
+
+def read_cache(directory: Path, meta: dict) -> pd.DataFrame:
+    """Memory-map the cached columns back into a DataFrame."""
+    data = {}
+    for entry in meta['columns']:
+        values = np.load(directory / entry['file'], mmap_mode='r')
+        if entry['kind'] == 'category':
+            categories = np.load(directory / entry['categories'], mmap_mode='r')
+            values = pd.Categorical.from_codes(values, categories=categories)
+        elif entry['kind'] == 'datetime':
+            values = pd.DatetimeIndex(values).tz_localize(entry['tz'])
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def cache_meta(directory: Path) -> dict:
+    try:
+        return json.loads((directory / 'meta.json').read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def load(name: str, refresh: bool = False) -> pd.DataFrame:
+    """Cleaned dataset by name (a key of DATASETS), from the cache unless the source changed or refresh is set.
+
+    Numeric columns of the result are read-only memory maps of the cache.
+    """
+    directory = CACHE_DIR / name
+    digest = source_hash(DATA_DIR / DATASETS[name]['file'])
+    meta = cache_meta(directory)
+    if refresh or meta.get('version') != CACHE_VERSION or meta.get('source_sha256') != digest:
+        write_cache(parse(name), directory, digest)
+        meta = cache_meta(directory)
+    return read_cache(directory, meta)
+
+
+def days_since_start(dates: pd.Series) -> np.ndarray:
+    """Whole days from the first date, the x axis of the notebook's time-series fits."""
+    return (dates - dates.min()).dt.days.to_numpy(dtype=float)
+
+
+def walmart_close() -> Tuple[np.ndarray, np.ndarray]:
+    """(days since the first trading day, closing price) of the Walmart stock."""
+    frame = load('walmart')
+    return days_since_start(frame['date']), frame['close'].to_numpy()
+
+
+def video_game_sales(max_sales: float = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """(years since the first release year, global sales) of games selling under max_sales million."""
+    frame = load('video_games')
+    frame = frame[frame['Global_Sales'] < max_sales]
+    years = frame['Year'].to_numpy(dtype=float)
+    return years - years.min(), frame['Global_Sales'].to_numpy()
+
+
+def load_all(refresh: bool = False) -> Dict[str, pd.DataFrame]:
+    return {name: load(name, refresh) for name in DATASETS}
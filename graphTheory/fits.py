@@ -0,0 +1,52 @@
+"""Least-squares curve fits of the graphTheory notebook, as functions.
+
+Each fit builds its design matrix and solves it with np.linalg.lstsq, the
+same way the notebook does inline. Polynomial coefficients are returned
+highest power first, as np.polyval expects.
+
+    from datasets import walmart_close
+    from fits import exponential_fit, exponential
+    x, y = walmart_close()
+    alpha, beta = exponential_fit(x, y)
+    trend = exponential(x, alpha, beta)
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def design_matrix(x: np.ndarray, degree: int) -> np.ndarray:
+    """Columns x**degree, ..., x, 1."""
+    return np.vander(np.asarray(x, dtype=float), degree + 1)
+
+
+def polynomial_fit(x: np.ndarray, y: np.ndarray, degree: int) -> np.ndarray:
+    """Coefficients of the least-squares polynomial of the given degree, highest power first."""
+    return np.linalg.lstsq(design_matrix(x, degree), np.asarray(y, dtype=float), rcond=None)[0]
+
+
+def linear_fit(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """(slope, intercept) of y = slope * x + intercept."""
+    return polynomial_fit(x, y, 1)
+
+
+def quadratic_fit(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """(a, b, c) of y = a * x**2 + b * x + c."""
+    return polynomial_fit(x, y, 2)
+
+
+def exponential_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """(alpha, beta) of y = alpha * exp(beta * x), fitted as a line through log(y).
+
+    y must be positive.
+    """
+    beta, log_alpha = linear_fit(x, np.log(y))
+    return float(np.exp(log_alpha)), float(beta)
+
+
+def polynomial(x: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+    return np.polyval(coefficients, x)
+
+
+def exponential(x: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+    return alpha * np.exp(beta * np.asarray(x, dtype=float))
@@ -0,0 +1,162 @@
+"""Batched fits of the cumulative case and death counts of every state in us-states.csv.
+
+state_matrix pivots the long table into a dense (state x date) array, NaN
+on days a state did not report. fit_states fits every row at once with a
+stacked QR least-squares solve, in which missing days get zero weight.
+rolling_fit refits every state over every window of consecutive days. It
+solves normal equations whose sums come from cumulative sums along the
+date axis, so a window costs the same whatever its length.
+
+Models are the ones of fits.py. Polynomial coefficients are highest power
+first, and exponential fits give (alpha, beta) of y = alpha * exp(beta * x).
+
+    python state_fits.py --model exponential --window 14
+"""
+import argparse
+import time
+from math import comb
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from datasets import load
+from fits import design_matrix
+
+# Degree of the polynomial each model fits, the exponential one through log(y)
+DEGREES = {'linear': 1, 'quadratic': 2, 'exponential': 1}
+
+
+def state_matrix(column: str = 'cases') -> Tuple[np.ndarray, pd.DatetimeIndex, np.ndarray]:
+    """(state names, every day from the first report to the last, (state x day) float array of column)."""
+    frame = load('us_states')
+    states = frame['state'].cat
+    dates = pd.date_range(frame['date'].min(), frame['date'].max(), freq='D')
+    days = (frame['date'] - dates[0]).dt.days.to_numpy()
+    values = np.full((len(states.categories), len(dates)), np.nan)
+    values[states.codes.to_numpy(), days] = frame[column].to_numpy()
+    return states.categories.to_numpy(dtype=str), dates, values
+
+
+def targets(values: np.ndarray, model: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(weights, y) to fit, with weight 0 on missing days and, for the exponential model, non-positive counts."""
+    values = np.asarray(values, dtype=float)
+    valid = np.isfinite(values)
+    if model == 'exponential':
+        valid &= values > 0
+        y = np.log(np.where(valid, values, 1))
+    else:
+        y = np.where(valid, values, 0)
+    return valid.astype(float), y
+
+
+def model_coefficients(coefficients: np.ndarray, model: str) -> np.ndarray:
+    """Turn the (beta, log alpha) line of an exponential fit into (alpha, beta)."""
+    if model == 'exponential':
+        return np.stack([np.exp(coefficients[..., 1]), coefficients[..., 0]], axis=-1)
+    return coefficients
+
+
+def solve(gram: np.ndarray, rhs: np.ndarray, enough: np.ndarray) -> np.ndarray:
+    """Batched solve, NaN where there were too few points for the system to have a single solution."""
+    gram = gram.copy()
+    gram[~enough] = np.eye(gram.shape[-1])
+    coefficients = np.linalg.solve(gram, rhs[..., None])[..., 0]
+    coefficients[~enough] = np.nan
+    return coefficients
+
+
+def fit_states(values: np.ndarray, model: str, x: np.ndarray = None) -> np.ndarray:
+    """Fit every row of a (state x day) array against x, by default the day number.
+
+    Returns (states, degree + 1) coefficients, NaN for states with too few usable days.
+    """
+    degree = DEGREES[model]
+    weights, y = targets(values, model)
+    x = np.arange(weights.shape[-1]) if x is None else x
+    # Zeroed rows drop the missing days out of each state's least-squares problem
+    design = weights[..., None] * design_matrix(x, degree)
+    q, r = np.linalg.qr(design)
+    rhs = np.einsum('std,st->sd', q, weights * y)
+    enough = weights.sum(axis=-1) > degree
+    return model_coefficients(solve(r, rhs, enough), model)
+
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums over every run of window consecutive entries along the last axis, from one cumulative sum."""
+    totals = np.cumsum(values, axis=-1)
+    totals = np.concatenate([np.zeros(values.shape[:-1] + (1,)), totals], axis=-1)
+    return totals[..., window:] - totals[..., :-window]
+
+
+def shift_matrix(origins: np.ndarray, degree: int) -> np.ndarray:
+    """(origins, degree + 1, degree + 1) matrices turning sums of t**j into sums of (t - origin)**k."""
+    shift = np.zeros((len(origins), degree + 1, degree + 1))
+    for k in range(degree + 1):
+        for j in range(k + 1):
+            shift[:, k, j] = comb(k, j) * (-origins) ** (k - j)
+    return shift
+
+
+def rolling_fit(values: np.ndarray, model: str, window: int) -> np.ndarray:
+    """Fit every row of a (state x day) array over each window of consecutive days.
+
+    Returns (states, days - window + 1, degree + 1) coefficients, indexed by the
+    first day of the window, with x counted in days from that first day.
+    """
+    degree = DEGREES[model]
+    weights, y = targets(values, model)
+    days = weights.shape[-1]
+    if not degree < window <= days:
+        raise ValueError(f"window must be between {degree + 1} and {days} days")
+    # Day numbers centred on the table keep the cumulative sums of powers small
+    t = np.arange(days) - (days - 1) / 2
+    powers = t ** np.arange(2 * degree + 1)[:, None]
+    # Sums of w * t**j and w * y * t**j over every window
+    moments = window_sums(weights[:, None, :] * powers, window)
+    products = window_sums((weights * y)[:, None, :] * powers[:degree + 1], window)
+    # ... re-expanded around each window's first day
+    origins = t[:days - window + 1]
+    moments = np.einsum('wkj,sjw->swk', shift_matrix(origins, 2 * degree), moments)
+    products = np.einsum('wkj,sjw->swk', shift_matrix(origins, degree), products)
+    # Normal equations with columns x**degree, ..., x, 1 as in design_matrix
+    power = degree - np.arange(degree + 1)
+    gram = moments[..., power[:, None] + power[None, :]]
+    enough = window_sums(weights, window) > degree
+    return model_coefficients(solve(gram, products[..., power], enough), model)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the cumulative counts of every state in us-states.csv")
+    parser.add_argument('--column', choices=['cases', 'deaths'], default='cases')
+    parser.add_argument('--model', choices=list(DEGREES), default='exponential')
+    parser.add_argument('--window', type=int, help="refit over every window of this many days")
+    args = parser.parse_args()
+
+    states, dates, values = state_matrix(args.column)
+    start = time.perf_counter()
+    if args.window:
+        coefficients = rolling_fit(values, args.model, args.window)
+        first_days = dates[:coefficients.shape[1]]
+        count = coefficients.shape[0] * coefficients.shape[1]
+    else:
+        coefficients = fit_states(values, args.model)
+        count = len(states)
+    elapsed = time.perf_counter() - start
+    print(f"{count} {args.model} fits of {args.column} in {elapsed * 1000:.1f} ms")
+
+    for state, fit in zip(states, coefficients):
+        if args.window:
+            # The latest window with enough reports
+            fitted = np.flatnonzero(~np.isnan(fit[:, 0]))
+            if not len(fitted):
+                continue
+            label = f"{first_days[fitted[-1]]:%Y-%m-%d} +{args.window}d"
+            fit = fit[fitted[-1]]
+        else:
+            label = f"from {dates[0]:%Y-%m-%d}"
+        print(f"{state:26} {label:16} " + "  ".join(f"{c:.6g}" for c in fit))
+
+
+if __name__ == "__main__":
+    main()
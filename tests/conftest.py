@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The modules are scripts run from their own directory, not an installed package
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / 'graphTheory'):
+    sys.path.insert(0, str(path))
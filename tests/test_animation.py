@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from fractal_animation import depth_sweep, palette_cycle, vector_frame, zoom_frame, zoom_path, zoom_tasks
+from fractal_batch import fit_viewport
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES
+
+
+def gif_frames(path):
+    """Every frame of a GIF decoded to an RGB array."""
+    with Image.open(path) as image:
+        frames = []
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append(np.asarray(image.convert('RGB')))
+    return frames
+
+
+@pytest.mark.parametrize('fractal', ["Koch Snowflake", "Sierpinski Triangle", "Cantor Set"])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_depth_sweep_gif_matches_vector_frames(tmp_path, fractal, workers):
+    path = tmp_path / 'sweep.gif'
+    assert depth_sweep(fractal, 4, str(path), width=160, height=160, hold=1, workers=workers) == 5
+    viewport = fit_viewport(FractalGenerator.VIEWPORTS[fractal], 160, 160)
+    frames = gif_frames(path)
+    assert len(frames) == 5
+    for depth, frame in enumerate(frames):
+        expected = vector_frame((fractal, depth, None, COLOR_SCHEMES["Vibrant"], 160, 160, viewport))
+        np.testing.assert_array_equal(frame, expected[..., :3])
+
+
+def test_zoom_gif_matches_zoom_frames(tmp_path):
+    path = tmp_path / 'zoom.gif'
+    center = ('-0.743643887037151', '0.131825904205330')
+    assert zoom_path(str(path), center, 100, frames=3, width=64, height=48, max_iter=100, workers=1) == 3
+    tasks = zoom_tasks(center, 100, 3, 64, 48, 100, None, FractalGenerator.MANDELBROT_BOUNDS)
+    for frame, task in zip(gif_frames(path), tasks):
+        np.testing.assert_array_equal(frame, zoom_frame(task)[..., :3])
+
+
+def test_palette_cycle_gif_has_every_frame(tmp_path):
+    path = tmp_path / 'cycle.gif'
+    assert palette_cycle(str(path), frames=4, width=64, height=48, max_iter=50, workers=1) == 4
+    frames = gif_frames(path)
+    assert len(frames) == 4
+    assert not np.array_equal(frames[0], frames[1])
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from fractal_batch import RenderJob, render_image
+from fractal_generator import FractalGenerator
+
+
+@pytest.mark.parametrize('depth', [8, 10])
+def test_cantor_renders_past_the_gui_depth_limit(depth):
+    image = render_image(RenderJob("Cantor Set", depth, 'unused.png', width=200, height=140))
+    assert image.shape == (140, 200, 4)
+    assert (image[..., :3] < 255).any()
+
+
+@pytest.mark.parametrize('depth', [0, 7, 8, 12])
+def test_cantor_styles_stay_in_range(depth):
+    generator = FractalGenerator()
+    for level in range(depth + 1):
+        linewidth, alpha = generator.cantor_style(depth - level, max(7, depth))
+        assert 0 <= alpha <= 1
+        assert 1 <= linewidth <= 4
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from fractal_cache import GeometryCache
+from fractal_engine import cantor_levels, koch_polyline, sierpinski_levels
+
+TRIANGLE = ((-200, -200), (0, 200), (200, -200))
+
+
+def test_cached_geometry_matches_engine():
+    cache = GeometryCache()
+    for cached, direct in zip(cache.sierpinski_levels(TRIANGLE, 6), sierpinski_levels(TRIANGLE, 6)):
+        assert cached.tobytes() == direct.tobytes()
+    outline = TRIANGLE + TRIANGLE[:1]
+    assert cache.koch_polyline(outline, 5).tobytes() == koch_polyline(outline, 5).tobytes()
+    for cached, direct in zip(cache.cantor_levels([(-200, 200)], 8), cantor_levels([(-200, 200)], 8)):
+        assert cached.tobytes() == direct.tobytes()
+
+
+def test_deeper_levels_reuse_shallower_ones():
+    cache = GeometryCache()
+    cache.sierpinski_levels(TRIANGLE, 4)
+    assert cache.stats()['misses'] == 5
+    levels = cache.sierpinski_levels(TRIANGLE, 5)
+    # Only the new level is computed, from the cached level 4
+    assert cache.stats()['misses'] == 6
+    assert levels[4] is cache.sierpinski_level(TRIANGLE, 4)
+
+
+def test_cached_arrays_are_read_only():
+    level = GeometryCache().cantor_level([(0, 1)], 3)
+    with pytest.raises(ValueError):
+        level[0, 0] = 5
+
+
+def test_least_recently_used_entries_are_evicted_to_fit():
+    cache = GeometryCache(max_bytes=3 * 800)
+    for key in 'abc':
+        cache.put(key, np.zeros(100))
+    cache.get_or_compute('a', lambda: None)
+    cache.put('d', np.zeros(100))
+    assert set(cache.entries) == {'a', 'c', 'd'}
+    assert cache.stats()['evictions'] == 1
+    assert cache.bytes == 3 * 800
+
+
+def test_values_larger_than_the_budget_are_returned_but_not_kept():
+    cache = GeometryCache(max_bytes=100)
+    value = cache.get_or_compute('big', lambda: np.zeros(100))
+    assert value.shape == (100,)
+    assert 'big' not in cache.entries and cache.bytes == 0
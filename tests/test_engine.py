@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from fractal_engine import complex_grid, escape_time
+
+
+def masked_escape_time(bounds, width, height, max_iter):
+    """The original loop, iterating every point each pass under a mask of the bounded ones."""
+    x_min, x_max, y_min, y_max = bounds
+    x = np.linspace(x_min, x_max, width)
+    y = np.linspace(y_min, y_max, height)
+    X, Y = np.meshgrid(x, y)
+    C = X + 1j * Y
+    Z = np.zeros_like(C)
+    iterations = np.zeros(C.shape, dtype=int)
+    for _ in range(max_iter):
+        mask = np.abs(Z) <= 2
+        Z[mask] = Z[mask] ** 2 + C[mask]
+        iterations += mask
+    return iterations
+
+
+@pytest.mark.parametrize('bounds, max_iter', [
+    ((-2.0, 1.0, -1.5, 1.5), 100),
+    ((-0.75, -0.73, 0.1, 0.12), 300),
+    ((-1.8, -1.7, -0.05, 0.05), 50),
+])
+def test_escape_time_matches_masked_loop(bounds, max_iter):
+    iterations, _ = escape_time(complex_grid(bounds, 120, 90), max_iter)
+    np.testing.assert_array_equal(iterations, masked_escape_time(bounds, 120, 90, max_iter))
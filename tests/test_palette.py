@@ -0,0 +1,61 @@
+import colorsys
+
+import numpy as np
+import pytest
+from matplotlib.colors import LinearSegmentedColormap, Normalize
+
+from fractal_palette import COLOR_SCHEMES, MANDELBROT_COLORS, _hsv_to_rgb, get_palette, mandelbrot_palette
+
+
+def colorsys_gradient(palette, depth, max_depth):
+    """The original per-call HSV interpolation of create_gradient_color."""
+    colors_hsv = []
+    for color in palette:
+        rgb = tuple(int(color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4))
+        colors_hsv.append(colorsys.rgb_to_hsv(rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0))
+    color_index = depth / max_depth * (len(colors_hsv) - 1)
+    lower_idx = int(color_index)
+    upper_idx = min(lower_idx + 1, len(colors_hsv) - 1)
+    if lower_idx == upper_idx:
+        selected_hsv = colors_hsv[lower_idx]
+    else:
+        t = color_index - lower_idx
+        selected_hsv = tuple(a + t * (b - a) for a, b in zip(colors_hsv[lower_idx], colors_hsv[upper_idx]))
+    rgb = colorsys.hsv_to_rgb(*selected_hsv)
+    return '#' + ''.join(f'{int(c * 255):02x}' for c in rgb)
+
+
+@pytest.mark.parametrize('scheme', list(COLOR_SCHEMES))
+def test_gradient_colors_match_colorsys(scheme):
+    colors = COLOR_SCHEMES[scheme]
+    for max_depth in range(1, 17):
+        for depth in range(max_depth + 1):
+            assert get_palette(colors).hex(depth / max_depth) == colorsys_gradient(colors, depth, max_depth)
+
+
+def test_hsv_to_rgb_matches_colorsys_exactly():
+    rng = np.random.default_rng(0)
+    hsv = rng.random((2000, 3))
+    # Greys, sector boundaries and the wrap at h = 1
+    hsv[:50, 1] = 0.0
+    hsv[50:100, 0] = np.arange(50) % 7 / 6
+    expected = np.array([colorsys.hsv_to_rgb(*row) for row in hsv])
+    np.testing.assert_array_equal(_hsv_to_rgb(hsv), expected)
+
+
+def test_mandelbrot_table_matches_matplotlib_colormap():
+    table = mandelbrot_palette().table
+    colormap = LinearSegmentedColormap.from_list('mandelbrot', MANDELBROT_COLORS, N=256)
+    np.testing.assert_allclose(table, colormap(np.arange(256)), atol=1e-12)
+
+
+@pytest.mark.parametrize('max_iter', [20, 100, 400])
+def test_map_bins_like_imshow(max_iter):
+    palette = mandelbrot_palette()
+    iterations = np.random.default_rng(max_iter).integers(0, max_iter + 1, size=(50, 40))
+    iterations[0, 0], iterations[-1, -1] = 0, max_iter
+    colormap = LinearSegmentedColormap.from_list('mandelbrot', MANDELBROT_COLORS, N=256)
+    expected = np.round(colormap(Normalize()(iterations)) * 255).astype(np.uint8)
+    np.testing.assert_array_equal(palette.map(iterations), expected)
+    # Interior points always get the last colour
+    np.testing.assert_array_equal(palette.map(iterations)[-1, -1], palette.table_uint8[-1])
@@ -0,0 +1,40 @@
+from decimal import Decimal, localcontext
+
+import numpy as np
+import pytest
+
+from fractal_engine import complex_grid, escape_time, escape_time_perturbation
+from fractal_generator import FractalGenerator
+
+CENTER = (Decimal('-0.743643887037151'), Decimal('0.131825904205330'))
+
+
+def decimal_escape_time(x: Decimal, y: Decimal, max_iter: int) -> int:
+    """Escape iteration of one point iterated entirely in 60-digit decimal arithmetic."""
+    with localcontext() as context:
+        context.prec = 60
+        zx = zy = Decimal(0)
+        for i in range(max_iter):
+            zx, zy = zx * zx - zy * zy + x, 2 * zx * zy + y
+            if zx * zx + zy * zy > 4:
+                return i + 1
+    return max_iter
+
+
+def test_perturbation_matches_direct_kernel_at_shallow_zoom():
+    half = 1e-3
+    x, y = float(CENTER[0]), float(CENTER[1])
+    direct, _ = escape_time(complex_grid((x - half, x + half, y - half, y + half), 60, 40), 300)
+    perturbed, _ = escape_time_perturbation(CENTER, half, half, 60, 40, 300)
+    assert (direct == perturbed).mean() > 0.99
+
+
+@pytest.mark.parametrize('span', [FractalGenerator.DEEP_ZOOM_SPAN / 2, 1e-9, 1e-12])
+def test_perturbation_matches_high_precision_iteration(span):
+    half = span / 2
+    iterations, _ = escape_time_perturbation(CENTER, half, half, 32, 32, 800)
+    offsets = np.linspace(-half, half, 32)
+    rng = np.random.default_rng(0)
+    for row, column in rng.integers(32, size=(12, 2)):
+        expected = decimal_escape_time(CENTER[0] + Decimal(offsets[column]), CENTER[1] + Decimal(offsets[row]), 800)
+        assert iterations[row, column] == expected
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from fractal_batch import RenderJob, render_image
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES
+from fractal_raster import Rasterizer, rasterize, rasterize_to_png
+
+
+def test_adjacent_triangles_cover_every_pixel_once():
+    raster = Rasterizer(10, 10, (0, 10, 0, 10))
+    square = np.array([[(0, 0), (10, 0), (0, 10)], [(10, 0), (10, 10), (0, 10)]], dtype=float)
+    raster.fill_triangles(square, (0, 0, 0), 0.5)
+    # A pixel filled twice would be darker than half grey
+    np.testing.assert_array_equal(raster.image()[..., :3], 128)
+
+
+def test_line_coverage_adds_up_to_its_width():
+    # At 72 dpi a point is one pixel
+    raster = Rasterizer(40, 20, (0, 40, 0, 20), dpi=72)
+    raster.add_segments(np.array([[(0, 10.3), (40, 10.3)]]), linewidth=2)
+    coverage = raster.stroke.reshape(20, 40)
+    np.testing.assert_allclose(coverage.sum(axis=0), 2, atol=1e-6)
+    assert set(np.flatnonzero(coverage.sum(axis=1))) == {8, 9, 10}
+
+
+def test_banded_png_matches_single_band(tmp_path):
+    generator = FractalGenerator()
+    viewport = generator.VIEWPORTS["Sierpinski Triangle"]
+
+    def draw(raster):
+        generator.rasterize_fractal(raster, "Sierpinski Triangle", 6, COLOR_SCHEMES["Ocean"])
+
+    path = tmp_path / 'bands.png'
+    rasterize_to_png(str(path), draw, 120, 90, viewport, band_rows=7)
+    with Image.open(path) as image:
+        banded = np.asarray(image.convert('RGB'))
+    np.testing.assert_array_equal(banded, rasterize(draw, 120, 90, viewport)[..., :3])
+
+
+@pytest.mark.parametrize('fractal', ["Sierpinski Triangle", "Koch Snowflake", "Cantor Set"])
+@pytest.mark.parametrize('depth', [0, 3, 6])
+def test_raster_backend_matches_agg(fractal, depth):
+    agg = render_image(RenderJob(fractal, depth, 'unused.png', width=300, height=300)).astype(int)
+    raster = render_image(RenderJob(fractal, depth, 'unused.png', width=300, height=300, backend='stream'))
+    difference = np.abs(agg - raster)[..., :3]
+    # Edges are anti-aliased differently, so only the bulk of the pixels has to agree
+    assert difference.mean() < 2
+    assert (difference.max(axis=-1) > 64).mean() < 0.02
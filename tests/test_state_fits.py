@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from fits import exponential_fit, polynomial_fit
+from state_fits import DEGREES, fit_states, rolling_fit
+
+
+def reference_fit(x, values, model):
+    """Per-series lstsq fit of fits.py on the usable days only, NaN with too few of them."""
+    valid = np.isfinite(values)
+    if model == 'exponential':
+        valid &= values > 0
+    degree = DEGREES[model]
+    if valid.sum() <= degree:
+        return np.full(degree + 1, np.nan)
+    if model == 'exponential':
+        return np.array(exponential_fit(x[valid], values[valid]))
+    return polynomial_fit(x[valid], values[valid], degree)
+
+
+@pytest.fixture
+def values():
+    """Growing cumulative counts with missing days, zero days and a state reporting only twice."""
+    rng = np.random.default_rng(0)
+    days = np.arange(60)
+    growth = rng.uniform(0.02, 0.1, size=(6, 1))
+    values = np.round(rng.uniform(5, 50, size=(6, 1)) * np.exp(growth * days) * rng.uniform(0.9, 1.1, (6, 60)))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[1, :10] = 0
+    values[2, 20:35] = np.nan
+    values[5] = np.nan
+    values[5, [3, 40]] = [10, 80]
+    return values
+
+
+@pytest.mark.parametrize('model', list(DEGREES))
+def test_fit_states_matches_lstsq(values, model):
+    x = np.arange(values.shape[1], dtype=float)
+    expected = np.array([reference_fit(x, row, model) for row in values])
+    np.testing.assert_allclose(fit_states(values, model), expected, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize('model', list(DEGREES))
+@pytest.mark.parametrize('window', [5, 14])
+def test_rolling_fit_matches_lstsq(values, model, window):
+    x = np.arange(window, dtype=float)
+    coefficients = rolling_fit(values, model, window)
+    assert coefficients.shape == (values.shape[0], values.shape[1] - window + 1, DEGREES[model] + 1)
+    for state, row in enumerate(values):
+        for start in range(values.shape[1] - window + 1):
+            expected = reference_fit(x, row[start:start + window], model)
+            np.testing.assert_allclose(coefficients[state, start], expected, rtol=1e-10, atol=1e-10)
+
+
+def test_rolling_fit_rejects_bad_windows(values):
+    with pytest.raises(ValueError):
+        rolling_fit(values, 'quadratic', 2)
+    with pytest.raises(ValueError):
+        rolling_fit(values, 'linear', values.shape[1] + 1)
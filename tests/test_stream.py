@@ -0,0 +1,71 @@
+import re
+from itertools import groupby
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from fractal_engine import cantor_levels, koch_polyline, sierpinski_levels
+from fractal_generator import FractalGenerator
+from fractal_palette import COLOR_SCHEMES
+from fractal_stream import cantor_chunks, koch_chunks, sierpinski_chunks, write_svg
+
+TRIANGLE = [(-200, -200), (0, 200), (200, -200)]
+
+
+def streamed_levels(chunks):
+    """Concatenate a (level, chunk) stream back into one array per level."""
+    return {level: np.concatenate([chunk for _, chunk in group]) for level, group in groupby(chunks, lambda c: c[0])}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 16])
+def test_sierpinski_chunks_match_levels(chunk_size):
+    levels = sierpinski_levels(TRIANGLE, 5)
+    streamed = streamed_levels(sierpinski_chunks(TRIANGLE, 5, chunk_size))
+    assert sorted(streamed) == list(range(6))
+    for level, triangles in enumerate(levels):
+        assert streamed[level].tobytes() == triangles.tobytes()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 64, 1 << 16])
+def test_koch_chunks_match_polyline(chunk_size):
+    outline = TRIANGLE + TRIANGLE[:1]
+    vertices = koch_polyline(outline, 4)
+    segments = np.stack([vertices[:-1], vertices[1:]], axis=1)
+    streamed = streamed_levels(koch_chunks(outline, 4, chunk_size))
+    assert list(streamed) == [4]
+    assert streamed[4].tobytes() == segments.tobytes()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64, 1 << 16])
+def test_cantor_chunks_match_levels(chunk_size):
+    levels = cantor_levels([(-200, 200)], 6)
+    streamed = streamed_levels(cantor_chunks([(-200, 200)], 6, 100, chunk_size=chunk_size))
+    assert sorted(streamed) == list(range(7))
+    for level, intervals in enumerate(levels):
+        assert streamed[level][:, :, 0].tobytes() == intervals.tobytes()
+        assert np.all(streamed[level][:, :, 1] == 100 - 10 * level)
+
+
+@pytest.mark.parametrize('depth', [3, 10, 14])
+def test_cantor_level_styles_match_agg_drawing(depth):
+    generator = FractalGenerator()
+    palette = COLOR_SCHEMES["Vibrant"]
+    ax = Figure().add_subplot()
+    generator.draw_layout("Cantor Set", depth, ax, palette)
+    styles = generator.level_styles("Cantor Set", depth, palette)
+    assert len(ax.lines) == len(styles) == depth + 1
+    for level, line in enumerate(ax.lines):
+        assert styles[level].stroke[3] == pytest.approx(line.get_alpha())
+        assert styles[level].linewidth == pytest.approx(line.get_linewidth())
+
+
+def test_deep_cantor_svg_opacities_in_range(tmp_path):
+    generator = FractalGenerator()
+    path = tmp_path / 'cantor.svg'
+    write_svg(str(path), generator.geometry_chunks("Cantor Set", 10),
+              generator.level_styles("Cantor Set", 10, COLOR_SCHEMES["Vibrant"]),
+              generator.VIEWPORTS["Cantor Set"], 200)
+    opacities = [float(value) for value in re.findall(r'stroke-opacity="([^"]+)"', path.read_text())]
+    assert len(opacities) == 11
+    assert all(0 <= opacity <= 1 for opacity in opacities)